@@ -1,3 +1,12 @@
+import heapq
+import random
+from array import array
+from operator import attrgetter
+from time import perf_counter
+
+import numpy as np
+
+
 class Node:
     def __init__(self, data=None):
         self.data = data
@@ -5,9 +14,37 @@ class Node:
 
 
 class LinkedList:
+    # Розмір буфера для попереднього сортування коротких серій (обмежений, тобто O(1) пам'яті)
+    RUN_BUFFER = 1024
+
     def __init__(self):
         self.head = None
 
+    def __iter__(self):
+        cur = self.head
+        while cur:
+            yield cur.data
+            cur = cur.next
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Побудова списку з будь-якого ітерованого джерела за один прохід"""
+        lst = cls()
+        lst.extend(iterable)
+        return lst
+
+    def extend(self, iterable):
+        """Додавання елементів у кінець: хвіст шукається один раз, далі вузли лише зв'язуються"""
+        dummy = Node()
+        dummy.next = self.head
+        tail = dummy
+        while tail.next:
+            tail = tail.next
+        for data in iterable:
+            tail.next = Node(data)
+            tail = tail.next
+        self.head = dummy.next
+
     def insert_at_beginning(self, data):
         new_node = Node(data)
         new_node.next = self.head
@@ -71,55 +108,113 @@ class LinkedList:
             current = next_node
         self.head = prev
 
-    def merge_sort(self):
-        """Сортування однозв'язного списку методом злиття"""
+    def merge_sort(self, key=None):
+        """Сортування однозв'язного списку методом злиття (висхідне, природними серіями)"""
         if self.head is None:
             return
-        self.head = self._merge_sort_recursive(self.head)
+        self.head = self._natural_merge_sort(self.head, key)
+
+    def _natural_merge_sort(self, head, key=None):
+        """Ітеративне висхідне злиття: без рекурсії та з O(1) додаткової пам'яті"""
+        head = self._presort_chunks(head, key)
+        while True:
+            dummy = Node()
+            tail = dummy
+            rest = head
+            merges = 0
+            while rest is not None:
+                left, left_tail, rest = self._take_run(rest, key)
+                if rest is None:
+                    tail.next = left
+                    break
+                right, right_tail, rest = self._take_run(rest, key)
+                tail.next, tail = self._merge_sorted_lists(left, left_tail, right, right_tail, key)
+                merges += 1
+            head = dummy.next
+            if merges == 0:
+                return head
+
+    def _presort_chunks(self, head, key=None):
+        """Сортування блоків по RUN_BUFFER вузлів, щоб злиття стартувало з довгих серій"""
+        sort_key = attrgetter("data") if key is None else (lambda node: key(node.data))
+        dummy = Node()
+        tail = dummy
+        buffer = []
+        cur = head
+        while cur is not None:
+            buffer.clear()
+            while cur is not None and len(buffer) < self.RUN_BUFFER:
+                buffer.append(cur)
+                cur = cur.next
+            buffer.sort(key=sort_key)
+            for node in buffer:
+                tail.next = node
+                tail = node
+        tail.next = None
+        buffer.clear()
+        return dummy.next
 
-    def _merge_sort_recursive(self, head):
-       
-        if head is None or head.next is None:
-            return head
-        
-        middle = self._get_middle(head)
-        next_to_middle = middle.next
-        middle.next = None
-        
-        left = self._merge_sort_recursive(head)
-        right = self._merge_sort_recursive(next_to_middle)
-        
-        return self._merge_sorted_lists(left, right)
+    @staticmethod
+    def _take_run(head, key=None):
+        """Відокремлення природної серії з початку списку (спадна серія розвертається)"""
+        nxt = head.next
+        if nxt is None:
+            return head, head, None
+
+        prev_key = head.data if key is None else key(head.data)
+        cur_key = nxt.data if key is None else key(nxt.data)
+
+        if cur_key < prev_key:
+            # Строго спадна серія: розвертаємо посилання на ходу, стабільність зберігається
+            run = head
+            run.next = None
+            while nxt is not None:
+                cur_key = nxt.data if key is None else key(nxt.data)
+                if not cur_key < prev_key:
+                    break
+                following = nxt.next
+                nxt.next = run
+                run = nxt
+                prev_key = cur_key
+                nxt = following
+            return run, head, nxt
+
+        tail = head
+        while nxt is not None:
+            cur_key = nxt.data if key is None else key(nxt.data)
+            if cur_key < prev_key:
+                break
+            prev_key = cur_key
+            tail = nxt
+            nxt = nxt.next
+        tail.next = None
+        return head, tail, nxt
 
-    def _get_middle(self, head):
-        """Знаходження середнього вузла списку"""
-        if head is None:
-            return head
-        
-        slow = head
-        fast = head
-        
-        while fast.next and fast.next.next:
-            slow = slow.next
-            fast = fast.next.next
-        
-        return slow
-
-    def _merge_sorted_lists(self, left, right):
-        """Злиття двох відсортованих списків"""
-        if left is None:
-            return right
-        if right is None:
-            return left
-        
-        if left.data <= right.data:
-            result = left
-            result.next = self._merge_sorted_lists(left.next, right)
-        else:
-            result = right
-            result.next = self._merge_sorted_lists(left, right.next)
-        
-        return result
+    @staticmethod
+    def _merge_sorted_lists(left, left_tail, right, right_tail, key=None):
+        """Злиття двох відсортованих списків; повертає голову і хвіст результату"""
+        dummy = Node()
+        current = dummy
+        left_key = left.data if key is None else key(left.data)
+        right_key = right.data if key is None else key(right.data)
+
+        while True:
+            if right_key < left_key:
+                current.next = right
+                current = right
+                right = right.next
+                if right is None:
+                    current.next = left
+                    return dummy.next, left_tail
+                right_key = right.data if key is None else key(right.data)
+            else:
+                current.next = left
+                current = left
+                left = left.next
+                if left is None:
+                    current.next = right
+                    return dummy.next, right_tail
+                left_key = left.data if key is None else key(left.data)
 
     @staticmethod
     def merge_two_sorted_lists(list1, list2):
@@ -150,6 +245,495 @@ class LinkedList:
         merged_list.head = dummy.next
         return merged_list
 
+    @staticmethod
+    def merge_k_sorted_lists(lists, key=None):
+        """Об'єднання k відсортованих списків через купу: O(N log k) часу, O(k) пам'яті, без копіювання вузлів"""
+        heap = []
+        for order, lst in enumerate(lists):
+            if lst.head is not None:
+                head = lst.head
+                heap.append((head.data if key is None else key(head.data), order, head))
+        heapq.heapify(heap)
+
+        dummy = Node()
+        current = dummy
+        while heap:
+            _, order, node = heap[0]
+            current.next = node
+            current = node
+            node = node.next
+            if node is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (node.data if key is None else key(node.data), order, node))
+        current.next = None
+
+        merged_list = LinkedList()
+        merged_list.head = dummy.next
+        return merged_list
+
+
+class CompactLinkedList:
+    """Однозв'язний список на суцільних масивах: вузол — це індекс у буферах values/next"""
+
+    NIL = -1
+    _FREED = -2
+
+    def __init__(self, typecode: str = "q"):
+        self.values = array(typecode)
+        self.next = array("q")
+        self.head = self.NIL
+        self.tail = self.NIL
+        self.size = 0
+        # Звільнені слоти зв'язані між собою через той самий масив next
+        self._free = self.NIL
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        values = self.values
+        nxt = self.next
+        cur = self.head
+        while cur != self.NIL:
+            yield values[cur]
+            cur = nxt[cur]
+
+    def _allocate(self, data) -> int:
+        """Виділення слота: спершу зі списку вільних, інакше в кінці буферів"""
+        if self._free != self.NIL:
+            idx = self._free
+            self._free = self._FREED - 1 - self.next[idx]
+            self.values[idx] = data
+            self.next[idx] = self.NIL
+        else:
+            idx = len(self.values)
+            self.values.append(data)
+            self.next.append(self.NIL)
+        self.size += 1
+        return idx
+
+    def _release(self, idx: int):
+        # Вільний слот зберігає FREED - 1 - наступний_вільний (завжди < NIL), тож його видно за next
+        self.next[idx] = self._FREED - 1 - self._free
+        self._free = idx
+        self.size -= 1
+
+    def is_live(self, idx: int) -> bool:
+        """Чи є idx живим вузлом: індекс, отриманий до видалення вузла, стає недійсним"""
+        return 0 <= idx < len(self.next) and self.next[idx] >= self.NIL
+
+    def insert_at_beginning(self, data):
+        idx = self._allocate(data)
+        self.next[idx] = self.head
+        self.head = idx
+        if self.tail == self.NIL:
+            self.tail = idx
+
+    def insert_at_end(self, data):
+        idx = self._allocate(data)
+        if self.head == self.NIL:
+            self.head = idx
+        else:
+            self.next[self.tail] = idx
+        self.tail = idx
+
+    def insert_after(self, prev_node: int | None, data):
+        if prev_node is None or not self.is_live(prev_node):
+            print("Попереднього вузла не існує.")
+            return
+        idx = self._allocate(data)
+        self.next[idx] = self.next[prev_node]
+        self.next[prev_node] = idx
+        if self.tail == prev_node:
+            self.tail = idx
+
+    def delete_node(self, key):
+        values = self.values
+        nxt = self.next
+        prev = self.NIL
+        cur = self.head
+        while cur != self.NIL and values[cur] != key:
+            prev = cur
+            cur = nxt[cur]
+        if cur == self.NIL:
+            return
+        if prev == self.NIL:
+            self.head = nxt[cur]
+        else:
+            nxt[prev] = nxt[cur]
+        if self.tail == cur:
+            self.tail = prev
+        self._release(cur)
+
+    def search_element(self, data) -> int:
+        """Індекс вузла або NIL; голова має індекс 0, тож перевіряйте idx != NIL, а не if idx"""
+        values = self.values
+        nxt = self.next
+        cur = self.head
+        while cur != self.NIL:
+            if values[cur] == data:
+                return cur
+            cur = nxt[cur]
+        return self.NIL
+
+    def print_list(self):
+        for value in self:
+            print(value)
+
+    def reverse(self):
+        """Реверсування списку зміною індексів next"""
+        nxt = self.next
+        prev = self.NIL
+        current = self.head
+        self.tail = current
+        while current != self.NIL:
+            following = nxt[current]
+            nxt[current] = prev
+            prev = current
+            current = following
+        self.head = prev
+
+    def merge_sort(self, key=None):
+        """Стабільне сортування; вузли після нього лежать у буферах підряд, вільні слоти звільняються.
+
+        Без key числові буфери сортуються np.sort прямо над пам'яттю array, без списку об'єктів Python.
+        """
+        typecode = self.values.typecode
+        if key is None and typecode != "u":
+            buffer = np.frombuffer(self.values, dtype=typecode)
+            if self.size != len(self.values):
+                buffer = buffer[np.frombuffer(self.next, dtype=np.int64) >= self.NIL]
+            ordered = array(typecode, np.sort(buffer, kind="stable").tobytes())
+        else:
+            ordered = array(typecode, sorted(self, key=key))
+        n = len(ordered)
+        self.values = ordered
+        self.next = array("q", np.arange(1, n + 1, dtype=np.int64).tobytes())
+        if n:
+            self.next[n - 1] = self.NIL
+        self.head = 0 if n else self.NIL
+        self.tail = n - 1 if n else self.NIL
+        self._free = self.NIL
+
+
+class IndexedNode(Node):
+    def __init__(self, data=None):
+        super().__init__(data)
+        self.prev = None
+
+
+class IndexedLinkedList(LinkedList):
+    """LinkedList з хвостом, довжиною та хеш-індексом значення → вузли (значення мають бути хешованими).
+
+    Для дублікатів search_element/delete_node беруть найраніше проіндексований вузол;
+    після reverse та merge_sort індекс перебудовується в порядку списку.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tail = None
+        self.size = 0
+        # Кошик значення — dict як впорядкована множина вузлів
+        self._index: dict = {}
+
+    def __len__(self):
+        return self.size
+
+    def _add_to_index(self, node: IndexedNode):
+        self._index.setdefault(node.data, {})[node] = None
+        self.size += 1
+
+    def _remove_from_index(self, node: IndexedNode):
+        bucket = self._index[node.data]
+        del bucket[node]
+        if not bucket:
+            del self._index[node.data]
+        self.size -= 1
+
+    def insert_at_beginning(self, data):
+        new_node = IndexedNode(data)
+        new_node.next = self.head
+        if self.head is None:
+            self.tail = new_node
+        else:
+            self.head.prev = new_node
+        self.head = new_node
+        self._add_to_index(new_node)
+
+    def insert_at_end(self, data):
+        new_node = IndexedNode(data)
+        if self.tail is None:
+            self.head = new_node
+        else:
+            new_node.prev = self.tail
+            self.tail.next = new_node
+        self.tail = new_node
+        self._add_to_index(new_node)
+
+    def extend(self, iterable):
+        for data in iterable:
+            self.insert_at_end(data)
+
+    def insert_after(self, prev_node: IndexedNode, data):
+        if prev_node is None:
+            print("Попереднього вузла не існує.")
+            return
+        new_node = IndexedNode(data)
+        new_node.prev = prev_node
+        new_node.next = prev_node.next
+        if new_node.next is None:
+            self.tail = new_node
+        else:
+            new_node.next.prev = new_node
+        prev_node.next = new_node
+        self._add_to_index(new_node)
+
+    def delete_node(self, key):
+        bucket = self._index.get(key)
+        if not bucket:
+            return
+        node = next(iter(bucket))
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        self._remove_from_index(node)
+
+    def search_element(self, data) -> IndexedNode | None:
+        bucket = self._index.get(data)
+        if not bucket:
+            return None
+        return next(iter(bucket))
+
+    def reverse(self):
+        super().reverse()
+        self._rebuild_index()
+
+    def merge_sort(self, key=None):
+        super().merge_sort(key)
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Відновлення prev, хвоста, довжини та індексу одним проходом"""
+        self._index = {}
+        self.size = 0
+        prev = None
+        cur = self.head
+        while cur:
+            cur.prev = prev
+            self._add_to_index(cur)
+            prev = cur
+            cur = cur.next
+        self.tail = prev
+
+
+class SkipNode:
+    __slots__ = ("data", "next", "width")
+
+    def __init__(self, data, level: int):
+        self.data = data
+        self.next = [None] * level
+        # width[i] — скільки вузлів нижнього рівня перестрибує посилання next[i]
+        self.width = [1] * level
+
+
+class SkipList:
+    """Впорядкована колекція на списку з пропусками: вставка, видалення, пошук і ранг за O(log n) в середньому"""
+
+    MAX_LEVEL = 32
+    P = 0.25
+
+    def __init__(self):
+        self._nil = SkipNode(None, 0)
+        self.head = SkipNode(None, self.MAX_LEVEL)
+        self.level = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        cur = self.head.next[0] if self.level else self._nil
+        while cur is not self._nil:
+            yield cur.data
+            cur = cur.next[0]
+
+    def __contains__(self, data):
+        return self.search_element(data) is not None
+
+    def __getitem__(self, index: int):
+        """Елемент за рангом (позицією у відсортованому порядку)"""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("SkipList index out of range")
+        node = self.head
+        remaining = index + 1
+        for level in reversed(range(self.level)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.data
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < self.P:
+            level += 1
+        return level
+
+    def _find_predecessors(self, data):
+        """Останні вузли з data < шуканого на кожному рівні та їхні ранги"""
+        chain = [self.head] * self.level
+        ranks = [0] * self.level
+        node = self.head
+        rank = 0
+        nil = self._nil
+        for level in reversed(range(self.level)):
+            nxt = node.next[level]
+            while nxt is not nil and nxt.data < data:
+                rank += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+            chain[level] = node
+            ranks[level] = rank
+        return chain, ranks
+
+    def insert(self, data):
+        """Вставка зі збереженням порядку; рівні значення стають перед уже наявними"""
+        new_level = self._random_level()
+        if new_level > self.level:
+            for level in range(self.level, new_level):
+                self.head.next[level] = self._nil
+                self.head.width[level] = self.size + 1
+            self.level = new_level
+
+        chain, ranks = self._find_predecessors(data)
+        new_node = SkipNode(data, new_level)
+        rank = ranks[0]
+        for level in range(new_level):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            steps = rank - ranks[level]
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+        for level in range(new_level, self.level):
+            chain[level].width[level] += 1
+        self.size += 1
+        return new_node
+
+    def delete_node(self, key):
+        chain, _ = self._find_predecessors(key)
+        if not chain:
+            return
+        target = chain[0].next[0]
+        if target is self._nil or target.data != key:
+            return
+        for level in range(self.level):
+            prev = chain[level]
+            if prev.next[level] is target:
+                prev.width[level] += target.width[level] - 1
+                prev.next[level] = target.next[level]
+            else:
+                prev.width[level] -= 1
+        self.size -= 1
+
+    def search_element(self, data) -> SkipNode | None:
+        chain, _ = self._find_predecessors(data)
+        if not chain:
+            return None
+        candidate = chain[0].next[0]
+        if candidate is not self._nil and candidate.data == data:
+            return candidate
+        return None
+
+    def rank(self, data) -> int:
+        """Кількість елементів, строго менших за data"""
+        _, ranks = self._find_predecessors(data)
+        return ranks[0] if ranks else 0
+
+    def range(self, lo=None, hi=None):
+        """Елементи з lo <= data < hi у порядку зростання (межа None — без обмеження)"""
+        if not self.level:
+            return
+        if lo is None:
+            node = self.head.next[0]
+        else:
+            chain, _ = self._find_predecessors(lo)
+            node = chain[0].next[0]
+        while node is not self._nil and (hi is None or node.data < hi):
+            yield node.data
+            node = node.next[0]
+
+    def print_list(self):
+        for data in self:
+            print(data)
+
+
+def merge_sorted(*sources, key=None):
+    """Ліниве k-шляхове злиття відсортованих списків, ітераторів чи генераторів; пам'ять O(k)"""
+    return heapq.merge(*sources, key=key)
+
+
+def iter_sorted_lines(path, encoding="utf-8"):
+    """Построкове читання відсортованого файлу для merge_sorted"""
+    with open(path, encoding=encoding) as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def benchmark_indexed_list(sizes=(2_000, 4_000, 8_000, 16_000)):
+    """Порівняння побудови списку вставкою в кінець та пошуку/видалення за ключем"""
+    print(f"{'n':>8} {'LinkedList, с':>16} {'IndexedLinkedList, с':>22}")
+    for n in sizes:
+        row = []
+        for cls in (LinkedList, IndexedLinkedList):
+            start = perf_counter()
+            lst = cls()
+            for i in range(n):
+                lst.insert_at_end(i)
+            for i in range(0, n, 10):
+                lst.search_element(i)
+                lst.delete_node(i)
+            row.append(perf_counter() - start)
+        print(f"{n:>8} {row[0]:>16.4f} {row[1]:>22.4f}")
+
+
+def benchmark_skip_list(sizes=(10_000, 100_000, 1_000_000), lookups=50):
+    """Впорядкована побудова та пошук: LinkedList + merge_sort проти SkipList (розміри до 10**7 задаються явно)"""
+    print(f"{'n':>10} {'побудова LL, с':>15} {'пошук LL, с':>13} {'побудова SL, с':>15} {'пошук SL, с':>13}")
+    for n in sizes:
+        values = [random.random() for _ in range(n)]
+        probes = random.sample(values, min(lookups, n))
+
+        start = perf_counter()
+        plain = LinkedList.from_iterable(values)
+        plain.merge_sort()
+        plain_build = perf_counter() - start
+        start = perf_counter()
+        for value in probes:
+            plain.search_element(value)
+        plain_search = perf_counter() - start
+        del plain
+
+        start = perf_counter()
+        skip = SkipList()
+        for value in values:
+            skip.insert(value)
+        skip_build = perf_counter() - start
+        start = perf_counter()
+        for value in probes:
+            skip.search_element(value)
+        skip_search = perf_counter() - start
+        del skip
+
+        print(f"{n:>10} {plain_build:>15.3f} {plain_search:>13.4f} {skip_build:>15.3f} {skip_search:>13.4f}")
+
 
 llist = LinkedList()
 
@@ -218,6 +802,10 @@ llist_sort.merge_sort()
 print("\nВідсортований список:")
 llist_sort.print_list()
 
+llist_sort.merge_sort(key=lambda x: -x)
+print("\nВідсортований за спаданням список (key=lambda x: -x):")
+llist_sort.print_list()
+
 # 3. Об'єднання двох відсортованих списків
 print("\n3. Об'єднання двох відсортованих списків")
 print("-" * 30)
@@ -242,4 +830,66 @@ list2.print_list()
 
 merged_list = LinkedList.merge_two_sorted_lists(list1, list2)
 print("\nОб'єднаний відсортований список:")
-merged_list.print_list()
\ No newline at end of file
+merged_list.print_list()
+
+# 4. Компактний список на масивах
+print("\n4. Компактний список на масивах (CompactLinkedList)")
+print("-" * 30)
+compact = CompactLinkedList()
+for value in (38, 27, 43, 3, 9):
+    compact.insert_at_end(value)
+compact.insert_at_beginning(82)
+compact.delete_node(43)
+compact.insert_after(compact.search_element(3), 10)
+print("Список:", list(compact))
+
+compact.merge_sort()
+print("Відсортований:", list(compact))
+
+compact.reverse()
+print("Реверсований:", list(compact))
+
+# 5. Індексований список
+print("\n5. Індексований список (IndexedLinkedList)")
+print("-" * 30)
+indexed = IndexedLinkedList()
+for value in (38, 27, 43, 3, 9):
+    indexed.insert_at_end(value)
+indexed.delete_node(43)
+indexed.insert_after(indexed.search_element(3), 10)
+indexed.merge_sort()
+print("Відсортований індексований список:")
+indexed.print_list()
+print("Довжина:", len(indexed), "хвіст:", indexed.tail.data)
+
+# 6. Злиття багатьох відсортованих джерел
+print("\n6. K-шляхове злиття")
+print("-" * 30)
+shards = [LinkedList.from_iterable(range(start, 12, 3)) for start in range(3)]
+print("Ліниве злиття зі списком і генератором:", list(merge_sorted(*shards, (x * 4 for x in range(3)))))
+merged_shards = LinkedList.merge_k_sorted_lists(shards)
+print("Злиття списків перезв'язуванням вузлів:", list(merged_shards))
+
+# 7. Список з пропусками
+print("\n7. Список з пропусками (SkipList)")
+print("-" * 30)
+skip = SkipList()
+for value in (38, 27, 43, 3, 9, 82, 10):
+    skip.insert(value)
+skip.delete_node(43)
+print("Елементи:", list(skip))
+print("27 у списку:", 27 in skip, "| ранг 27:", skip.rank(27), "| діапазон [9, 38):", list(skip.range(9, 38)))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", action="store_true", help="Запустити бенчмарки")
+    args = parser.parse_args()
+
+    if args.bench:
+        print("\nБенчмарк: вставка в кінець + пошук/видалення за ключем")
+        benchmark_indexed_list()
+        print("\nБенчмарк: LinkedList + merge_sort проти SkipList")
+        benchmark_skip_list()
@@ -1,9 +1,18 @@
 import argparse
 import math
+import numpy as np
 import matplotlib.pyplot as plt
+from functools import lru_cache
+from pathlib import Path
+from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
 
 
 COLOR = "#a1493e"
+ANIMATION_WRITERS = {".mp4": "ffmpeg", ".gif": "pillow"}
+TILE_CACHE_SIZE = 256
+# Зум без відсікання коштує стільки ж, скільки все дерево, тож у bbox поріг LOD не буває нульовим
+BBOX_LOD_PIXELS = 0.5
 
 
 def draw_line(ax, start: complex, end: complex, linewidth=1.6):
@@ -18,20 +27,260 @@ def draw_branch(ax,
                 scale: float,
                 branch_angle_rad: float,
                 linewidth: float,
-                pause: float):
+                pause: float,
+                min_length: float = 0.0):
     
     end = start + length * complex(math.cos(angle_rad), math.sin(angle_rad))
     draw_line(ax, start, end, linewidth=linewidth)
     if pause:
         plt.pause(pause)
 
-    if depth <= 0:
+    child_len = length * scale
+    if depth <= 0 or child_len < min_length:
         return
 
-    
-    child_len = length * scale
-    draw_branch(ax, end, child_len, angle_rad + branch_angle_rad, depth - 1, scale, branch_angle_rad, linewidth, pause)
-    draw_branch(ax, end, child_len, angle_rad - branch_angle_rad, depth - 1, scale, branch_angle_rad, linewidth, pause)
+    draw_branch(ax, end, child_len, angle_rad + branch_angle_rad, depth - 1, scale, branch_angle_rad, linewidth, pause,
+                min_length)
+    draw_branch(ax, end, child_len, angle_rad - branch_angle_rad, depth - 1, scale, branch_angle_rad, linewidth, pause,
+                min_length)
+
+
+def _discs_hit_box(centers: np.ndarray, radius: float, bbox) -> np.ndarray:
+    xmin, ymin, xmax, ymax = bbox
+    dx = np.maximum(np.maximum(xmin - centers.real, centers.real - xmax), 0.0)
+    dy = np.maximum(np.maximum(ymin - centers.imag, centers.imag - ymax), 0.0)
+    return dx * dx + dy * dy <= radius * radius
+
+
+def branch_levels(start: complex,
+                  length: float,
+                  angle_rad: float,
+                  depth: int,
+                  scale: float,
+                  branch_angle_rad: float,
+                  min_length: float = 0.0,
+                  bbox=None):
+    """Геометрія draw_branch, обчислена порівнево: для кожного рівня — комплексні масиви (starts, ends).
+
+    min_length обриває рівні з гілками, коротшими за поріг (LOD); bbox = (xmin, ymin, xmax, ymax)
+    відкидає гілки, чиє піддерево цілком поза прямокутником.
+    """
+    starts = np.array([start], dtype=np.complex128)
+    directions = np.array([complex(math.cos(angle_rad), math.sin(angle_rad))], dtype=np.complex128)
+    turns = np.array([complex(math.cos(branch_angle_rad), math.sin(branch_angle_rad)),
+                      complex(math.cos(branch_angle_rad), -math.sin(branch_angle_rad))])
+    # Усе піддерево гілки довжини L лежить у крузі радіуса L / (1 - scale) навколо її початку
+    reach = 1.0 / (1.0 - scale) if scale < 1.0 else math.inf
+    for level in range(depth + 1):
+        if length < min_length:
+            return
+        if bbox is not None:
+            keep = _discs_hit_box(starts, length * reach, bbox)
+            starts = starts[keep]
+            directions = directions[keep]
+            if not starts.size:
+                return
+        ends = starts + length * directions
+        yield starts, ends
+        if level == depth:
+            return
+        starts = np.repeat(ends, 2)
+        directions = (directions[:, None] * turns).ravel()
+        length *= scale
+
+
+def level_polyline(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Усі відрізки рівня як одна ламана (3k, 2): start, end, NaN — розрив між відрізками"""
+    points = np.full((starts.size, 3, 2), np.nan)
+    points[:, 0, 0] = starts.real
+    points[:, 0, 1] = starts.imag
+    points[:, 1, 0] = ends.real
+    points[:, 1, 1] = ends.imag
+    return points.reshape(-1, 2)
+
+
+def draw_branch_fast(ax,
+                     start: complex,
+                     length: float,
+                     angle_rad: float,
+                     depth: int,
+                     scale: float,
+                     branch_angle_rad: float,
+                     linewidth: float,
+                     min_length: float = 0.0,
+                     bbox=None) -> LineCollection:
+    # Один шлях на рівень замість Path на кожен відрізок: LineCollection будується за частки секунди
+    paths = [level_polyline(starts, ends)
+             for starts, ends in branch_levels(start, length, angle_rad, depth, scale, branch_angle_rad,
+                                               min_length, bbox)]
+    collection = LineCollection(paths, colors=COLOR, linewidths=linewidth)
+    ax.add_collection(collection, autolim=False)
+    if paths:
+        ax.update_datalim([np.nanmin([np.nanmin(p, axis=0) for p in paths], axis=0),
+                           np.nanmax([np.nanmax(p, axis=0) for p in paths], axis=0)])
+    return collection
+
+
+def animate_levels(fig,
+                   ax,
+                   start: complex,
+                   length: float,
+                   angle_rad: float,
+                   depth: int,
+                   scale: float,
+                   branch_angle_rad: float,
+                   linewidth: float,
+                   interval: int = 200,
+                   min_length: float = 0.0) -> FuncAnimation:
+    """Анімація: один кадр — цілий рівень; з blit перемальовуються лише рівні, а не все полотно"""
+    collections = []
+    for starts, ends in branch_levels(start, length, angle_rad, depth, scale, branch_angle_rad, min_length):
+        collection = LineCollection([level_polyline(starts, ends)], colors=COLOR, linewidths=linewidth)
+        collection.set_visible(False)
+        ax.add_collection(collection, autolim=False)
+        collections.append(collection)
+
+    def init():
+        for collection in collections:
+            collection.set_visible(False)
+        return collections
+
+    def update(frame: int):
+        collections[frame].set_visible(True)
+        return collections[:frame + 1]
+
+    return FuncAnimation(fig, update, frames=len(collections), init_func=init,
+                         interval=interval, blit=True, repeat=False)
+
+
+def tree_extent(size: float, scale: float):
+    """Межі всього дерева (xmin, ymin, xmax, ymax) з полями"""
+    s = scale
+    inv = max(1 - s, 1e-6)
+    horiz = size * (s / inv)
+    vert = size * (1 + s / inv)
+    margin = 1.08
+    return -horiz * margin, -size * 0.3, horiz * margin, vert * margin
+
+
+def tree_axes(size: float, scale: float, figsize=(10, 8), bbox=None):
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+    xmin, ymin, xmax, ymax = bbox if bbox is not None else tree_extent(size, scale)
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+    return fig, ax
+
+
+def pixel_size(ax) -> float:
+    """Розмір одного пікселя екрана в одиницях даних для поточних меж осей"""
+    ax.apply_aspect()
+    x0, x1 = ax.get_xlim()
+    return abs(x1 - x0) / max(ax.get_window_extent().width, 1.0)
+
+
+def tile_bounds(zoom: int, ix: int, iy: int, size: float, scale: float):
+    """Прямокутник тайла: на рівні zoom квадрат дерева ділиться на 2**zoom × 2**zoom тайлів"""
+    xmin, ymin, xmax, ymax = tree_extent(size, scale)
+    side = max(xmax - xmin, ymax - ymin) / 2 ** zoom
+    x0 = xmin + ix * side
+    y0 = ymin + iy * side
+    return x0, y0, x0 + side, y0 + side
+
+
+@lru_cache(maxsize=TILE_CACHE_SIZE)
+def tree_tile(zoom: int,
+              ix: int,
+              iy: int,
+              depth: int,
+              size: float,
+              scale: float,
+              branch_angle_deg: float,
+              tile_pixels: int,
+              lod_pixels: float) -> tuple:
+    """Ламані рівнів гілок, піддерева яких перетинають тайл; результат кешується"""
+    bbox = tile_bounds(zoom, ix, iy, size, scale)
+    min_length = lod_pixels * (bbox[2] - bbox[0]) / tile_pixels
+    angle_rad = math.radians(90.0)
+    levels = branch_levels(complex(0.0, size), size * scale, angle_rad, depth - 1,
+                           scale, math.radians(branch_angle_deg), min_length, bbox)
+    return tuple(level_polyline(starts, ends) for starts, ends in levels)
+
+
+def draw_view(ax,
+              bbox,
+              depth: int,
+              size: float = 3.0,
+              scale: float = 0.7,
+              branch_angle_deg: float = 45.0,
+              linewidth: float = 1.8,
+              lod_pixels: float = BBOX_LOD_PIXELS) -> LineCollection:
+    """Рендер лише видимого фрагмента bbox: збирається з кешованих тайлів, що його перетинають.
+
+    Непозитивний lod_pixels замінюється на BBOX_LOD_PIXELS.
+    """
+    if lod_pixels <= 0:
+        lod_pixels = BBOX_LOD_PIXELS
+    xmin, ymin, xmax, ymax = bbox
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+
+    ext_xmin, ext_ymin, ext_xmax, ext_ymax = tree_extent(size, scale)
+    world = max(ext_xmax - ext_xmin, ext_ymax - ext_ymin)
+    view = max(xmax - xmin, ymax - ymin)
+    # Тайл не менший за вікно, тож видно не більше 2×2 тайлів
+    zoom = max(0, math.floor(math.log2(world / view)))
+    side = world / 2 ** zoom
+    # Роздільність тайла округлюємо до степеня двійки, щоб близькі масштаби брали ті самі тайли з кешу
+    tile_pixels = 2 ** math.ceil(math.log2(max(side / pixel_size(ax), 1.0)))
+
+    paths = [level_polyline(np.array([0j]), np.array([complex(0.0, size)]))]
+    for ix in range(math.floor((xmin - ext_xmin) / side), math.floor((xmax - ext_xmin) / side) + 1):
+        for iy in range(math.floor((ymin - ext_ymin) / side), math.floor((ymax - ext_ymin) / side) + 1):
+            paths.extend(tree_tile(zoom, ix, iy, depth, size, scale, branch_angle_deg, tile_pixels, lod_pixels))
+    collection = LineCollection(paths, colors=COLOR, linewidths=linewidth)
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def render_tree(output: str,
+                depth: int,
+                size: float = 3.0,
+                scale: float = 0.7,
+                linewidth: float = 1.8,
+                branch_angle_deg: float = 45.0,
+                fps: int = 5,
+                lod_pixels: float = 0.0,
+                bbox=None) -> None:
+    """Рендер дерева у файл без вікна: .png/.svg/.pdf — статично, .mp4/.gif — анімація по рівнях"""
+    angle_rad = math.radians(90.0)
+    branch_angle_rad = math.radians(branch_angle_deg)
+    start = complex(0.0, 0.0)
+    end = start + size * complex(math.cos(angle_rad), math.sin(angle_rad))
+
+    suffix = Path(output).suffix.lower()
+    if bbox is not None and suffix in ANIMATION_WRITERS:
+        raise ValueError(f"Zoomed (bbox) views are static; use .png/.svg/.pdf instead of {suffix}")
+    fig, ax = tree_axes(size, scale, bbox=bbox)
+    try:
+        if bbox is not None:
+            draw_view(ax, bbox, depth, size, scale, branch_angle_deg, linewidth, lod_pixels)
+            fig.savefig(output)
+            return
+        draw_line(ax, start, end, linewidth=linewidth)
+        min_length = lod_pixels * pixel_size(ax)
+        if suffix in ANIMATION_WRITERS:
+            anim = animate_levels(fig, ax, end, size * scale, angle_rad, depth - 1,
+                                  scale, branch_angle_rad, linewidth, min_length=min_length)
+            anim.save(output, writer=ANIMATION_WRITERS[suffix], fps=fps)
+        else:
+            draw_branch_fast(ax, end, size * scale, angle_rad, depth - 1,
+                             scale, branch_angle_rad, linewidth, min_length)
+            fig.savefig(output, bbox_inches="tight")
+    finally:
+        plt.close(fig)
 
 
 def main():
@@ -41,12 +290,36 @@ def main():
     parser.add_argument("--speed", type=float, default=0.0008, help="Pause duration in seconds for live drawing")
     parser.add_argument("--size", type=float, default=3.0, help="Initial trunk length")
     parser.add_argument("--scale", type=float, default=0.7, help="Scale factor for branch length per level")
+    parser.add_argument("--fast", action="store_true",
+                        help="Compute levels with NumPy and draw one LineCollection (no live animation)")
+    parser.add_argument("--animate", action="store_true",
+                        help="Animate a whole level per frame with blitting")
+    parser.add_argument("--output", "-o", help="Render headless to file.png|svg|pdf|mp4|gif instead of a window")
+    parser.add_argument("--lod", type=float, default=0.0,
+                        help="Skip branches shorter than this many screen pixels (0 disables culling; --bbox uses 0.5 instead)")
+    parser.add_argument("--bbox", type=float, nargs=4, metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
+                        help="Zoom: render only subtrees intersecting this box, from cached tiles")
     args = parser.parse_args()
 
-    plt.ion()
-    fig, ax = plt.subplots(figsize=(10, 8))
-    ax.set_aspect("equal")
-    ax.axis("off")
+    if args.output:
+        if args.bbox and Path(args.output).suffix.lower() in ANIMATION_WRITERS:
+            parser.error("--bbox renders a static view; use a .png/.svg/.pdf output")
+        plt.switch_backend("Agg")
+        render_tree(args.output, args.depth, size=args.size, scale=args.scale, linewidth=args.linewidth,
+                    lod_pixels=args.lod, bbox=args.bbox)
+        return
+
+    if args.bbox:
+        fig, ax = tree_axes(args.size, args.scale, bbox=args.bbox)
+        draw_view(ax, args.bbox, args.depth, args.size, args.scale, linewidth=args.linewidth,
+                  lod_pixels=args.lod)
+        plt.show()
+        return
+
+    if not (args.fast or args.animate):
+        plt.ion()
+    fig, ax = tree_axes(args.size, args.scale)
+    min_length = args.lod * pixel_size(ax)
 
     size = args.size
     angle_rad = math.radians(90.0) 
@@ -57,19 +330,21 @@ def main():
     end = start + size * complex(math.cos(angle_rad), math.sin(angle_rad))
     draw_line(ax, start, end, linewidth=args.linewidth)
 
-    
-    
-    s = args.scale
-    inv = max(1 - s, 1e-6)
-    horiz = size * (s / inv)
-    vert = size * (1 + s / inv)
-    margin = 1.08
-    ax.set_xlim(-horiz * margin, horiz * margin)
-    ax.set_ylim(-size * 0.3, vert * margin)
+    if args.animate:
+        # Посилання тримаємо до кінця show(), інакше анімацію прибере збирач сміття
+        anim = animate_levels(fig, ax, end, size * args.scale, angle_rad, args.depth - 1,
+                              args.scale, branch_angle_rad, args.linewidth, min_length=min_length)
+        plt.show()
+        return
+
+    if args.fast:
+        draw_branch_fast(ax, end, size * args.scale, angle_rad + 0.0, args.depth - 1,
+                         args.scale, branch_angle_rad, args.linewidth, min_length)
+        plt.show()
+        return
 
-    
     draw_branch(ax, end, size * args.scale, angle_rad + 0.0, args.depth - 1,
-                args.scale, branch_angle_rad, args.linewidth, args.speed)
+                args.scale, branch_angle_rad, args.linewidth, args.speed, min_length)
 
    
     plt.ioff()
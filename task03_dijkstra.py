@@ -1,17 +1,390 @@
 
+import csv
 import heapq
-from typing import Any, Dict, List, Optional, Tuple
+import json
+import math
+import struct
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from operator import itemgetter
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 
 
-def dijkstra(G: nx.Graph, start: Any) -> Tuple[Dict[Any, float], Dict[Any, Optional[Any]]]: 
+class CSRGraph:
+    """Граф у форматі CSR: сусіди вершини i — targets[offsets[i]:offsets[i + 1]] з вагами weights[...].
+
+    Вершини всередині — цілі 0..n-1; labels[i] повертає початкову мітку, index[label] — її номер.
+    """
+
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                 labels: Optional[Sequence[Hashable]] = None):
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.targets = np.ascontiguousarray(targets, dtype=np.int64)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        # Мітки та зворотний індекс будуються лише на вимогу, щоб відкриття memmap-графа було миттєвим
+        self._labels: Optional[List[Hashable]] = list(labels) if labels is not None else None
+        self._index: Optional[Dict[Hashable, int]] = None
+
+    @property
+    def labels(self) -> List[Hashable]:
+        if self._labels is None:
+            self._labels = list(range(self.num_nodes))
+        return self._labels
+
+    @property
+    def index(self) -> Dict[Hashable, int]:
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def nodes(self) -> List[Hashable]:
+        return self.labels
+
+    @classmethod
+    def from_edges(cls, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray, num_nodes: int,
+                   labels: Optional[Sequence[Hashable]] = None, directed: bool = False) -> "CSRGraph":
+        """Побудова з масивів ребер (номери вершин 0..num_nodes-1); неорієнтовані ребра дублюються"""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if not directed:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            weights = np.concatenate([weights, weights])
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+        return cls(offsets, targets[order], weights[order], labels)
+
+    @classmethod
+    def from_networkx(cls, G: nx.Graph) -> "CSRGraph":
+        labels = list(G.nodes)
+        index = {label: i for i, label in enumerate(labels)}
+        m = G.number_of_edges()
+        sources = np.empty(m, dtype=np.int64)
+        targets = np.empty(m, dtype=np.int64)
+        weights = np.empty(m, dtype=np.float64)
+        for k, (u, v, w) in enumerate(G.edges(data="weight", default=1.0)):
+            sources[k] = index[u]
+            targets[k] = index[v]
+            weights[k] = w
+        return cls.from_edges(sources, targets, weights, len(labels), labels, directed=G.is_directed())
+
+
+def load_edge_list(path: str, delimiter: Optional[str] = None, directed: bool = False,
+                   node_type: Callable[[str], Hashable] = str, skip_header: bool = False,
+                   chunk_size: int = 1_000_000) -> CSRGraph:
+    """Потокове читання CSV/TSV-рядків "u v [weight]" порціями одразу в масиви CSRGraph.
+
+    delimiter=None — будь-які пробільні символи; для CSV передайте ",". Вага за замовчуванням 1.0.
+    """
+    index: Dict[Hashable, int] = {}
+    labels: List[Hashable] = []
+    sources = array("q")
+    targets = array("q")
+    weights = array("d")
+
+    def node_id(token: str) -> int:
+        label = node_type(token.strip())
+        i = index.get(label)
+        if i is None:
+            i = index[label] = len(labels)
+            labels.append(label)
+        return i
+
+    with open(path, encoding="utf-8") as f:
+        if skip_header:
+            next(f, None)
+        while True:
+            chunk = list(islice(f, chunk_size))
+            if not chunk:
+                break
+            for line in chunk:
+                fields = line.split(delimiter)
+                if len(fields) < 2 or fields[0].lstrip().startswith("#"):
+                    continue
+                sources.append(node_id(fields[0]))
+                targets.append(node_id(fields[1]))
+                weights.append(float(fields[2]) if len(fields) > 2 else 1.0)
+
+    graph = CSRGraph.from_edges(np.frombuffer(sources, dtype=np.int64), np.frombuffer(targets, dtype=np.int64),
+                                np.frombuffer(weights, dtype=np.float64), len(labels), labels, directed=directed)
+    graph._index = index
+    return graph
+
+
+# Заголовок бінарного формату: магія, версія, n, m, зсув блоку міток (0 — мітки 0..n-1)
+_CSR_HEADER = struct.Struct("<4sIQQQ")
+_CSR_MAGIC = b"CSRG"
+_CSR_VERSION = 1
+# Масиви offsets, targets, weights у файлі завжди little-endian, як і заголовок
+_CSR_DTYPES = (np.dtype("<i8"), np.dtype("<i8"), np.dtype("<f8"))
+
+
+def _labels_to_json(labels: List[Any]) -> bytes:
+    return json.dumps(labels).encode("utf-8")
+
+
+def _labels_from_json(raw: bytes) -> List[Any]:
+    """JSON не має кортежів, тож списки-мітки повертаються кортежами"""
+    return [tuple(label) if isinstance(label, list) else label for label in json.loads(raw)]
+
+
+def save_csr(graph: CSRGraph, path: str) -> None:
+    """Запис CSRGraph у файл: заголовок, offsets, targets, weights і, за потреби, мітки в JSON"""
+    n, m = graph.num_nodes, graph.num_edges
+    with open(path, "wb") as f:
+        f.write(_CSR_HEADER.pack(_CSR_MAGIC, _CSR_VERSION, n, m, 0))
+        for arr, dtype in zip((graph.offsets, graph.targets, graph.weights), _CSR_DTYPES):
+            f.write(np.ascontiguousarray(arr, dtype=dtype).tobytes())
+        labels_offset = 0
+        if graph._labels is not None and graph._labels != list(range(n)):
+            labels_offset = f.tell()
+            f.write(_labels_to_json(graph._labels))
+            f.seek(0)
+            f.write(_CSR_HEADER.pack(_CSR_MAGIC, _CSR_VERSION, n, m, labels_offset))
+
+
+def load_csr(path: str, mmap: bool = True, load_labels: bool = True) -> CSRGraph:
+    """Відкриття файлу save_csr; з mmap=True масиви не читаються, а відображаються в пам'ять"""
+    with open(path, "rb") as f:
+        magic, version, n, m, labels_offset = _CSR_HEADER.unpack(f.read(_CSR_HEADER.size))
+        if magic != _CSR_MAGIC or version != _CSR_VERSION:
+            raise ValueError(f"'{path}' is not a CSR graph file")
+        labels = None
+        if labels_offset and load_labels:
+            f.seek(labels_offset)
+            labels = _labels_from_json(f.read())
+
+    arrays = []
+    offset = _CSR_HEADER.size
+    for dtype, count in zip(_CSR_DTYPES, (n + 1, m, m)):
+        if mmap:
+            arr = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+        else:
+            arr = np.fromfile(path, dtype=dtype, count=count, offset=offset)
+        # На big-endian машині memoryview у dijkstra_csr потребує рідного порядку байтів — тоді копіюємо
+        arrays.append(arr if dtype.isnative else arr.astype(dtype.newbyteorder("=")))
+        offset += count * dtype.itemsize
+    return CSRGraph(*arrays, labels=labels)
+
+
+def dijkstra_csr(graph: CSRGraph, source: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Дейкстра над CSRGraph за номерами вершин: масив відстаней і масив попередників (-1 — немає)"""
+    n = graph.num_nodes
+    if not 0 <= source < n:
+        raise ValueError(f"Start node '{source}' not in graph")
+    # memoryview індексується швидше за скаляри NumPy і не копіює буфери
+    offsets = memoryview(graph.offsets)
+    targets = memoryview(graph.targets)
+    weights = memoryview(graph.weights)
+    distances = array("d", [float("inf")]) * n
+    previous = array("q", [-1]) * n
+    settled = bytearray(n)
+    distances[source] = 0.0
+
+    heap: List[Tuple[float, int]] = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if settled[u]:
+            continue
+        settled[u] = 1
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + weights[e]
+            if nd < distances[v]:
+                distances[v] = nd
+                previous[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    return np.frombuffer(distances, dtype=np.float64), np.frombuffer(previous, dtype=np.int64)
+
+
+class BucketQueue:
+    """Черга Дайала: кільце з max_weight + 1 кошиків для цілих ваг з [0, max_weight]"""
+
+    def __init__(self, max_weight: int):
+        self.buckets: List[List[Tuple[float, Any]]] = [[] for _ in range(max_weight + 1)]
+        self.cursor = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, priority: float, item: Any) -> None:
+        # Живі ключі лежать у [cursor, cursor + max_weight], тож кошик за модулем однозначний
+        self.buckets[int(priority) % len(self.buckets)].append((priority, item))
+        self.size += 1
+
+    def pop(self) -> Tuple[float, Any]:
+        n = len(self.buckets)
+        while not self.buckets[self.cursor % n]:
+            self.cursor += 1
+        self.size -= 1
+        return self.buckets[self.cursor % n].pop()
+
+
+class RadixHeap:
+    """Радикс-купа для монотонних цілих ключів: кошик — довжина key ^ last у бітах"""
+
+    def __init__(self):
+        self.buckets: List[List[Tuple[float, Any]]] = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, priority: float, item: Any) -> None:
+        self.buckets[(int(priority) ^ self.last).bit_length()].append((priority, item))
+        self.size += 1
+
+    def pop(self) -> Tuple[float, Any]:
+        if not self.buckets[0]:
+            i = 1
+            while not self.buckets[i]:
+                i += 1
+            bucket, self.buckets[i] = self.buckets[i], []
+            self.last = int(min(priority for priority, _ in bucket))
+            for priority, item in bucket:
+                self.buckets[(int(priority) ^ self.last).bit_length()].append((priority, item))
+        self.size -= 1
+        return self.buckets[0].pop()
+
+
+class IndexedHeap:
+    """Бінарна купа з індексом позицій: push наявного елемента з меншим пріоритетом — це decrease-key"""
+
+    def __init__(self):
+        self.keys: List[float] = []
+        self.items: List[Any] = []
+        self.pos: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def push(self, priority: float, item: Any) -> None:
+        i = self.pos.get(item)
+        if i is None:
+            i = len(self.items)
+            self.keys.append(priority)
+            self.items.append(item)
+            self.pos[item] = i
+        elif priority < self.keys[i]:
+            self.keys[i] = priority
+        else:
+            return
+        self._sift_up(i)
+
+    def pop(self) -> Tuple[float, Any]:
+        keys, items = self.keys, self.items
+        key, item = keys[0], items[0]
+        last_key, last_item = keys.pop(), items.pop()
+        del self.pos[item]
+        if items:
+            keys[0], items[0] = last_key, last_item
+            self.pos[last_item] = 0
+            self._sift_down(0)
+        return key, item
+
+    def _sift_up(self, i: int) -> None:
+        keys, items, pos = self.keys, self.items, self.pos
+        key, item = keys[i], items[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if keys[parent] <= key:
+                break
+            keys[i], items[i] = keys[parent], items[parent]
+            pos[items[i]] = i
+            i = parent
+        keys[i], items[i] = key, item
+        pos[item] = i
+
+    def _sift_down(self, i: int) -> None:
+        keys, items, pos = self.keys, self.items, self.pos
+        n = len(items)
+        key, item = keys[i], items[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and keys[child + 1] < keys[child]:
+                child += 1
+            if keys[child] >= key:
+                break
+            keys[i], items[i] = keys[child], items[child]
+            pos[items[i]] = i
+            i = child
+        keys[i], items[i] = key, item
+        pos[item] = i
+
+
+QUEUE_KINDS = ("heapq", "dial", "radix", "indexed", "auto")
+# Для більших цілих ваг кільце Дайала займає забагато пам'яті — тоді обирається радикс-купа
+DIAL_MAX_WEIGHT = 1 << 12
+
+
+def _integer_weight_bound(G: nx.Graph) -> Optional[int]:
+    """Найбільша вага, якщо всі ваги — скінченні невід'ємні цілі, інакше None"""
+    bound = 0
+    for _, _, w in G.edges(data="weight", default=1.0):
+        if not math.isfinite(w) or w < 0 or w != int(w):
+            return None
+        bound = max(bound, int(w))
+    return bound
+
+
+def select_queue(G: nx.Graph, kind: str = "auto"):
+    """Черга з пріоритетом для dijkstra; "auto" за один прохід по вагах обирає dial, radix або heapq"""
+    if kind not in QUEUE_KINDS:
+        raise ValueError(f"Unknown queue '{kind}', expected one of {QUEUE_KINDS}")
+    if kind == "heapq":
+        return None
+    if kind == "indexed":
+        return IndexedHeap()
+    bound = _integer_weight_bound(G)
+    if kind == "auto":
+        if bound is None:
+            return None
+        kind = "dial" if bound <= DIAL_MAX_WEIGHT else "radix"
+    if bound is None:
+        raise ValueError(f"Queue '{kind}' requires non-negative integer weights")
+    return BucketQueue(bound) if kind == "dial" else RadixHeap()
+
+
+def dijkstra(G: nx.Graph | CSRGraph, start: Any,
+             queue: str = "heapq") -> Tuple[Dict[Any, float], Dict[Any, Optional[Any]]]: 
+    """queue — "heapq", "dial", "radix", "indexed" або "auto" (лише для nx.Graph)"""
+    if isinstance(G, CSRGraph):
+        if queue != "heapq":
+            raise ValueError(f"Queue '{queue}' is not supported for CSRGraph; only 'heapq' is")
+        return _dijkstra_csr_labels(G, start)
     distances: Dict[Any, float] = {n: float('inf') for n in G.nodes}
     if start not in distances:
         raise ValueError(f"Start node '{start}' not in graph")
     distances[start] = 0.0
     previous: Dict[Any, Optional[Any]] = {n: None for n in G.nodes}
 
+    pq = select_queue(G, queue)
+    if pq is not None:
+        return _dijkstra_with_queue(G, start, pq, distances, previous)
+
     heap: List[Tuple[float, Any]] = [(0.0, start)]
     visited: set[Any] = set()
 
@@ -34,6 +407,585 @@ def dijkstra(G: nx.Graph, start: Any) -> Tuple[Dict[Any, float], Dict[Any, Optio
     return distances, previous
 
 
+def _dijkstra_with_queue(G: nx.Graph, start: Any, pq, distances: Dict[Any, float],
+                         previous: Dict[Any, Optional[Any]]) -> Tuple[Dict[Any, float], Dict[Any, Optional[Any]]]:
+    pq.push(0.0, start)
+    visited: set[Any] = set()
+
+    while pq:
+        d, u = pq.pop()
+        if u in visited or d > distances[u]:
+            continue
+        visited.add(u)
+
+        for v, attrs in G[u].items():
+            nd = d + float(attrs.get('weight', 1.0))
+            if nd < distances[v]:
+                distances[v] = nd
+                previous[v] = u
+                pq.push(nd, v)
+
+    return distances, previous
+
+
+def benchmark_queues(n: int = 20_000, degrees: Sequence[int] = (2, 8, 32), max_weight: int = 100) -> None:
+    """Порівняння черг з пріоритетом на випадкових графах з цілими вагами різної щільності"""
+    kinds = ("heapq", "dial", "radix", "indexed")
+    print(f"{'ступінь':>8} " + " ".join(f"{kind + ', с':>12}" for kind in kinds))
+    rng = np.random.default_rng(0)
+    for degree in degrees:
+        G = nx.gnm_random_graph(n, n * degree // 2, seed=degree)
+        for (u, v), w in zip(G.edges, rng.integers(1, max_weight + 1, G.number_of_edges()).tolist()):
+            G[u][v]['weight'] = w
+        timings = []
+        reference = None
+        for kind in kinds:
+            start = time.perf_counter()
+            distances, _ = dijkstra(G, 0, queue=kind)
+            timings.append(time.perf_counter() - start)
+            if reference is None:
+                reference = distances
+            elif distances != reference:
+                raise AssertionError(f"Queue '{kind}' disagrees with heapq")
+        print(f"{degree:>8} " + " ".join(f"{t:>12.3f}" for t in timings))
+
+
+def _dijkstra_csr_labels(graph: CSRGraph, start: Any) -> Tuple[Dict[Any, float], Dict[Any, Optional[Any]]]:
+    if start not in graph.index:
+        raise ValueError(f"Start node '{start}' not in graph")
+    dist, prev = dijkstra_csr(graph, graph.index[start])
+    labels = graph.labels
+    distances = dict(zip(labels, dist.tolist()))
+    previous = {label: (labels[p] if p >= 0 else None) for label, p in zip(labels, prev.tolist())}
+    return distances, previous
+
+
+# Граф у спільній пам'яті, до якого під'єднується кожен робочий процес пулу
+_worker_graph: Optional[CSRGraph] = None
+_worker_buffers: List[SharedMemory] = []
+_worker_matrices: Dict[str, np.memmap] = {}
+
+
+def _attach_worker(specs: List[Tuple[str, Tuple[int, ...], str]]) -> None:
+    global _worker_graph
+    arrays = []
+    for name, shape, dtype in specs:
+        shm = SharedMemory(name=name)
+        _worker_buffers.append(shm)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    _worker_graph = CSRGraph(*arrays)
+
+
+def _distance_row(source: int) -> Tuple[int, np.ndarray]:
+    distances, _ = dijkstra_csr(_worker_graph, source)
+    return source, distances
+
+
+def _distance_row_to_matrix(task: Tuple[int, str]) -> int:
+    source, path = task
+    matrix = _worker_matrices.get(path)
+    if matrix is None:
+        n = _worker_graph.num_nodes
+        matrix = _worker_matrices[path] = np.memmap(path, dtype=np.float64, mode="r+", shape=(n, n))
+    matrix[source] = dijkstra_csr(_worker_graph, source)[0]
+    return source
+
+
+@contextmanager
+def _shared_graph_pool(graph: CSRGraph, workers: Optional[int]):
+    """Пул процесів, що бачать масиви графа через спільну пам'ять без копіювання у кожен процес"""
+    buffers: List[SharedMemory] = []
+    specs = []
+    try:
+        for arr in (graph.offsets, graph.targets, graph.weights):
+            shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+            buffers.append(shm)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+            specs.append((shm.name, arr.shape, arr.dtype.str))
+        with Pool(workers, initializer=_attach_worker, initargs=(specs,)) as pool:
+            yield pool
+    finally:
+        for shm in buffers:
+            shm.close()
+            shm.unlink()
+
+
+def _as_csr(G: nx.Graph | CSRGraph) -> CSRGraph:
+    return G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+
+
+def multi_source_dijkstra(G: nx.Graph | CSRGraph, sources: Iterable[Any], workers: Optional[int] = None,
+                          chunksize: int = 1) -> Iterator[Tuple[Any, np.ndarray]]:
+    """Паралельна Дейкстра від багатьох джерел: рядки (джерело, відстані в порядку graph.labels) у міру готовності"""
+    graph = _as_csr(G)
+    indices = []
+    for source in sources:
+        if source not in graph.index:
+            raise ValueError(f"Start node '{source}' not in graph")
+        indices.append(graph.index[source])
+    with _shared_graph_pool(graph, workers) as pool:
+        for source, distances in pool.imap_unordered(_distance_row, indices, chunksize):
+            yield graph.labels[source], distances
+
+
+def all_pairs_dijkstra(G: nx.Graph | CSRGraph, path: str, workers: Optional[int] = None,
+                       chunksize: int = 1) -> np.memmap:
+    """Матриця n × n відстаней у файлі path (memmap); рядки й стовпці — у порядку вершин CSRGraph"""
+    graph = _as_csr(G)
+    n = graph.num_nodes
+    np.memmap(path, dtype=np.float64, mode="w+", shape=(n, n)).flush()
+    tasks = [(source, path) for source in range(n)]
+    with _shared_graph_pool(graph, workers) as pool:
+        for _ in pool.imap_unordered(_distance_row_to_matrix, tasks, chunksize):
+            pass
+    return np.memmap(path, dtype=np.float64, mode="r", shape=(n, n))
+
+
+def _check_endpoints(G: nx.Graph, source: Any, target: Any) -> None:
+    for node in (source, target):
+        if node not in G:
+            raise ValueError(f"Node '{node}' not in graph")
+
+
+def _path_from(previous: Dict[Any, Any], end: Any) -> List[Any]:
+    path = [end]
+    while previous[path[-1]] is not None:
+        path.append(previous[path[-1]])
+    path.reverse()
+    return path
+
+
+def shortest_path(G: nx.Graph, source: Any, target: Any) -> Tuple[float, List[Any]]:
+    """Дейкстра від source, що зупиняється, щойно target остаточно оброблено; (відстань, шлях)"""
+    _check_endpoints(G, source, target)
+    distances: Dict[Any, float] = {source: 0.0}
+    previous: Dict[Any, Optional[Any]] = {source: None}
+    heap: List[Tuple[float, Any]] = [(0.0, source)]
+    visited: set[Any] = set()
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in visited:
+            continue
+        if u == target:
+            return d, _path_from(previous, target)
+        visited.add(u)
+        for v, attrs in G[u].items():
+            nd = d + float(attrs.get('weight', 1.0))
+            if nd < distances.get(v, float('inf')):
+                distances[v] = nd
+                previous[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    return float('inf'), []
+
+
+def bidirectional_dijkstra(G: nx.Graph, source: Any, target: Any) -> Tuple[float, List[Any]]:
+    """Зустрічний пошук від source і target; зупинка, коли сума верхівок куп не менша за найкращий шлях"""
+    _check_endpoints(G, source, target)
+    if source == target:
+        return 0.0, [source]
+    # Для орієнтованого графа зворотний пошук іде по вхідних ребрах
+    adjacency = (G.succ, G.pred) if G.is_directed() else (G.adj, G.adj)
+    distances: Tuple[Dict[Any, float], Dict[Any, float]] = ({source: 0.0}, {target: 0.0})
+    previous: Tuple[Dict[Any, Any], Dict[Any, Any]] = ({source: None}, {target: None})
+    heaps: Tuple[List[Tuple[float, Any]], List[Tuple[float, Any]]] = ([(0.0, source)], [(0.0, target)])
+    visited: Tuple[set, set] = (set(), set())
+    best = float('inf')
+    meeting: Optional[Any] = None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if u in visited[side]:
+            continue
+        visited[side].add(u)
+        dist, other = distances[side], distances[1 - side]
+        for v, attrs in adjacency[side][u].items():
+            nd = d + float(attrs.get('weight', 1.0))
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                previous[side][v] = u
+                heapq.heappush(heaps[side], (nd, v))
+            if v in other and dist[v] + other[v] < best:
+                best = dist[v] + other[v]
+                meeting = v
+
+    if meeting is None:
+        return float('inf'), []
+    forward = _path_from(previous[0], meeting)
+    node = previous[1][meeting]
+    while node is not None:
+        forward.append(node)
+        node = previous[1][node]
+    return best, forward
+
+
+def euclidean_heuristic(pos: Dict[Any, Tuple[float, float]]) -> Callable[[Any, Any], float]:
+    """Евристика для A*: пряма відстань між координатами вершин (допустима, якщо ваги ≥ довжини відрізків)"""
+    def heuristic(u: Any, v: Any) -> float:
+        (x1, y1), (x2, y2) = pos[u], pos[v]
+        return math.hypot(x1 - x2, y1 - y2)
+    return heuristic
+
+
+def astar(G: nx.Graph, source: Any, target: Any,
+          heuristic: Optional[Callable[[Any, Any], float]] = None) -> Tuple[float, List[Any]]:
+    """A*: Дейкстра з пріоритетом d + heuristic(v, target); без евристики збігається з shortest_path"""
+    _check_endpoints(G, source, target)
+    if heuristic is None:
+        return shortest_path(G, source, target)
+    distances: Dict[Any, float] = {source: 0.0}
+    previous: Dict[Any, Optional[Any]] = {source: None}
+    heap: List[Tuple[float, float, Any]] = [(heuristic(source, target), 0.0, source)]
+    visited: set[Any] = set()
+
+    while heap:
+        _, d, u = heapq.heappop(heap)
+        if u in visited:
+            continue
+        if u == target:
+            return d, _path_from(previous, target)
+        visited.add(u)
+        for v, attrs in G[u].items():
+            nd = d + float(attrs.get('weight', 1.0))
+            if nd < distances.get(v, float('inf')):
+                distances[v] = nd
+                previous[v] = u
+                heapq.heappush(heap, (nd + heuristic(v, target), nd, v))
+
+    return float('inf'), []
+
+
+class ContractionHierarchy:
+    """Ієрархія стискань: одноразова підготовка статичного графа, далі запити двобічним пошуком угору.
+
+    upward — дуги до вершин вищого рангу, downward — обернені дуги, що ведуть угору з боку цілі;
+    middle[(u, w)] — вершина, через яку проходить скорочення u → w.
+    """
+
+    WITNESS_SETTLE_LIMIT = 200
+
+    def __init__(self, upward: CSRGraph, downward: CSRGraph, rank: np.ndarray, middle: Dict[Tuple[int, int], int]):
+        self.upward = upward
+        self.downward = downward
+        self.rank = rank
+        self.middle = middle
+
+    @property
+    def labels(self) -> List[Hashable]:
+        return self.upward.labels
+
+    @classmethod
+    def build(cls, G: nx.Graph) -> "ContractionHierarchy":
+        labels = list(G.nodes)
+        index = {label: i for i, label in enumerate(labels)}
+        n = len(labels)
+        out_adj: List[Dict[int, float]] = [{} for _ in range(n)]
+        in_adj: List[Dict[int, float]] = [{} for _ in range(n)]
+        middle: Dict[Tuple[int, int], int] = {}
+        contracted = bytearray(n)
+        contracted_neighbors = [0] * n
+        rank = np.zeros(n, dtype=np.int64)
+
+        def add_arc(a: int, b: int, w: float) -> bool:
+            if a == b or w >= out_adj[a].get(b, float('inf')):
+                return False
+            out_adj[a][b] = w
+            in_adj[b][a] = w
+            return True
+
+        for u, v, w in G.edges(data="weight", default=1.0):
+            add_arc(index[u], index[v], float(w))
+            if not G.is_directed():
+                add_arc(index[v], index[u], float(w))
+
+        def witness_distances(source: int, skip: int, limit: float) -> Dict[int, float]:
+            """Обмежений пошук від source в обхід skip серед ще не стиснених вершин"""
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                settled += 1
+                if d > limit or settled > cls.WITNESS_SETTLE_LIMIT:
+                    break
+                for x, w in out_adj[u].items():
+                    if contracted[x] or x == skip:
+                        continue
+                    nd = d + w
+                    if nd < dist.get(x, float('inf')):
+                        dist[x] = nd
+                        heapq.heappush(heap, (nd, x))
+            return dist
+
+        def needed_shortcuts(v: int):
+            ins = [(u, w) for u, w in in_adj[v].items() if not contracted[u]]
+            outs = [(x, w) for x, w in out_adj[v].items() if not contracted[x]]
+            shortcuts = []
+            if ins and outs:
+                max_out = max(w for _, w in outs)
+                for u, wu in ins:
+                    dist = witness_distances(u, v, wu + max_out)
+                    for x, wx in outs:
+                        if x != u and dist.get(x, float('inf')) > wu + wx:
+                            shortcuts.append((u, x, wu + wx))
+            # Пріоритет — різниця ребер плюс кількість уже стиснених сусідів
+            priority = len(shortcuts) - len(ins) - len(outs) + contracted_neighbors[v]
+            return priority, shortcuts, ins, outs
+
+        heap = [(needed_shortcuts(v)[0], v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            priority, shortcuts, ins, outs = needed_shortcuts(v)
+            # Ліниве оновлення: якщо пріоритет погіршився, вершина повертається в чергу
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, v))
+                continue
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+            for u, x, w in shortcuts:
+                if add_arc(u, x, w):
+                    middle[(u, x)] = v
+            for u, _ in ins:
+                contracted_neighbors[u] += 1
+            for x, _ in outs:
+                contracted_neighbors[x] += 1
+
+        up: Tuple[List[int], List[int], List[float]] = ([], [], [])
+        down: Tuple[List[int], List[int], List[float]] = ([], [], [])
+        for a in range(n):
+            for b, w in out_adj[a].items():
+                if rank[b] > rank[a]:
+                    up[0].append(a); up[1].append(b); up[2].append(w)
+                else:
+                    down[0].append(b); down[1].append(a); down[2].append(w)
+        upward = CSRGraph.from_edges(*up, n, labels, directed=True)
+        downward = CSRGraph.from_edges(*down, n, labels, directed=True)
+        return cls(upward, downward, rank, middle)
+
+    def save(self, path: str) -> None:
+        """Збереження у бінарний .npz; мітки — JSON-блок, як у save_csr, тож мають серіалізуватися в JSON"""
+        middle = np.array([(u, w, v) for (u, w), v in self.middle.items()], dtype=np.int64).reshape(-1, 3)
+        labels = np.frombuffer(_labels_to_json(self.labels), dtype=np.uint8)
+        with open(path, "wb") as f:
+            np.savez(f,
+                     labels=labels,
+                     rank=self.rank,
+                     up_offsets=self.upward.offsets, up_targets=self.upward.targets, up_weights=self.upward.weights,
+                     down_offsets=self.downward.offsets, down_targets=self.downward.targets,
+                     down_weights=self.downward.weights,
+                     middle=middle)
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        with np.load(path, allow_pickle=False) as data:
+            labels = _labels_from_json(data["labels"].tobytes())
+            upward = CSRGraph(data["up_offsets"], data["up_targets"], data["up_weights"], labels)
+            downward = CSRGraph(data["down_offsets"], data["down_targets"], data["down_weights"], labels)
+            middle = {(u, w): v for u, w, v in data["middle"].tolist()}
+            return cls(upward, downward, data["rank"], middle)
+
+    def query(self, source: Any, target: Any) -> Tuple[float, List[Any]]:
+        """Двобічний пошук лише вгору за рангом; повертає (відстань, шлях у початкових мітках)"""
+        index = self.upward.index
+        for node in (source, target):
+            if node not in index:
+                raise ValueError(f"Node '{node}' not in graph")
+        s, t = index[source], index[target]
+        graphs = [(memoryview(g.offsets), memoryview(g.targets), memoryview(g.weights))
+                  for g in (self.upward, self.downward)]
+        distances: Tuple[Dict[int, float], Dict[int, float]] = ({s: 0.0}, {t: 0.0})
+        previous: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+        heaps: List[List[Tuple[float, int]]] = [[(0.0, s)], [(0.0, t)]]
+        best = float('inf')
+        meeting = -1
+
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            d, u = heapq.heappop(heaps[side])
+            if d >= best:
+                heaps[side].clear()
+                continue
+            dist = distances[side]
+            if d > dist[u]:
+                continue
+            other = distances[1 - side]
+            if u in other and d + other[u] < best:
+                best = d + other[u]
+                meeting = u
+            offsets, targets, weights = graphs[side]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                nd = d + weights[e]
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    previous[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+
+        if meeting < 0:
+            return float('inf'), []
+        chain = [meeting]
+        while previous[0][chain[-1]] >= 0:
+            chain.append(previous[0][chain[-1]])
+        chain.reverse()
+        while previous[1][chain[-1]] >= 0:
+            chain.append(previous[1][chain[-1]])
+
+        path = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            self._unpack(a, b, path)
+        labels = self.labels
+        return best, [labels[i] for i in path]
+
+    def _unpack(self, a: int, b: int, path: List[int]) -> None:
+        """Розгортання скорочення a → b у дуги початкового графа (без рекурсії)"""
+        stack = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            m = self.middle.get((x, y))
+            if m is None:
+                path.append(y)
+            else:
+                stack.append((m, y))
+                stack.append((x, m))
+
+
+class ShortestPathCache:
+    """LRU-кеш дерев найкоротших шляхів за джерелом із лічильником версій графа.
+
+    Ребра змінюються через set_edge_weight/remove_edge (або mark_changed після зміни G напряму);
+    при наступному get() закешоване дерево ремонтується інкрементно: перераховується лише
+    піддерево під ребром, що подорожчало, та вершини, яким вигідне здешевлене ребро.
+    Повернені словники належать кешу — не змінюйте їх.
+    """
+
+    def __init__(self, G: nx.Graph, maxsize: int = 32):
+        self.G = G
+        self.maxsize = maxsize
+        self.version = 0
+        # Для кожного дерева поруч зберігається карта дітей, щоб ремонт не відновлював її з previous
+        self._trees: "OrderedDict[Any, Tuple[int, Dict[Any, float], Dict[Any, Optional[Any]], Dict[Any, set]]]" \
+            = OrderedDict()
+        # _changes[i] переводить граф з версії _changes_base + i у наступну
+        self._changes: List[Tuple[Any, Any]] = []
+        self._changes_base = 0
+
+    def get(self, source: Any) -> Tuple[Dict[Any, float], Dict[Any, Optional[Any]]]:
+        entry = self._trees.get(source)
+        if entry is None:
+            distances, previous = dijkstra(self.G, source)
+            children: Dict[Any, set] = {}
+            for node, parent in previous.items():
+                if parent is not None:
+                    children.setdefault(parent, set()).add(node)
+            self._trees[source] = (self.version, distances, previous, children)
+            if len(self._trees) > self.maxsize:
+                self._trees.popitem(last=False)
+        else:
+            version, distances, previous, children = entry
+            self._trees.move_to_end(source)
+            if version < self.version:
+                changed = set(self._changes[version - self._changes_base:])
+                self._repair(distances, previous, children, changed)
+                self._trees[source] = (self.version, distances, previous, children)
+        self._trim_changes()
+        return distances, previous
+
+    def set_edge_weight(self, u: Any, v: Any, weight: float) -> None:
+        self.G.add_edge(u, v, weight=weight)
+        self.mark_changed(u, v)
+
+    def remove_edge(self, u: Any, v: Any) -> None:
+        self.G.remove_edge(u, v)
+        self.mark_changed(u, v)
+
+    def mark_changed(self, u: Any, v: Any) -> None:
+        self.version += 1
+        self._changes.append((u, v))
+
+    def _trim_changes(self) -> None:
+        oldest = min((entry[0] for entry in self._trees.values()), default=self.version)
+        del self._changes[:oldest - self._changes_base]
+        self._changes_base = oldest
+
+    def _repair(self, distances: Dict[Any, float], previous: Dict[Any, Optional[Any]],
+                children: Dict[Any, set], changed: set) -> None:
+        G = self.G
+        inf = float('inf')
+
+        def relink(node: Any, parent: Optional[Any]) -> None:
+            old = previous[node]
+            if old is not None:
+                children[old].discard(node)
+            previous[node] = parent
+            if parent is not None:
+                children.setdefault(parent, set()).add(node)
+
+        arcs = set(changed)
+        if not G.is_directed():
+            arcs |= {(v, u) for u, v in changed}
+        if len(distances) != G.number_of_nodes():
+            for node in G.nodes:
+                if node not in distances:
+                    distances[node] = inf
+                    previous[node] = None
+
+        def weight(a: Any, b: Any) -> float:
+            return float(G[a][b].get('weight', 1.0)) if G.has_edge(a, b) else inf
+
+        # Ребро дерева подорожчало або зникло — усе піддерево під ним втрачає відстані
+        roots = [b for a, b in arcs if previous.get(b) == a and distances[a] + weight(a, b) > distances[b]]
+        affected: set = set()
+        stack = roots
+        while stack:
+            node = stack.pop()
+            if node in affected:
+                continue
+            affected.add(node)
+            stack.extend(children.get(node, ()))
+        for node in affected:
+            distances[node] = inf
+            relink(node, None)
+
+        heap: List[Tuple[float, Any]] = []
+        predecessors = G.pred if G.is_directed() else G.adj
+        for node in affected:
+            for p, attrs in predecessors[node].items():
+                if p not in affected:
+                    nd = distances[p] + float(attrs.get('weight', 1.0))
+                    if nd < distances[node]:
+                        distances[node] = nd
+                        relink(node, p)
+            if distances[node] < inf:
+                heapq.heappush(heap, (distances[node], node))
+        # Здешевлене чи нове ребро може скоротити шлях до своєї кінцевої вершини
+        for a, b in arcs:
+            nd = distances.get(a, inf) + weight(a, b)
+            if nd < distances[b]:
+                distances[b] = nd
+                relink(b, a)
+                heapq.heappush(heap, (nd, b))
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > distances[u]:
+                continue
+            for v, attrs in G[u].items():
+                nd = d + float(attrs.get('weight', 1.0))
+                if nd < distances[v]:
+                    distances[v] = nd
+                    relink(v, u)
+                    heapq.heappush(heap, (nd, v))
+
+
 def reconstruct_path(previous: Dict[Any, Optional[Any]], start: Any, end: Any) -> List[Any]:
     path: List[Any] = []
     cur: Optional[Any] = end
@@ -44,24 +996,85 @@ def reconstruct_path(previous: Dict[Any, Optional[Any]], start: Any, end: Any) -
     return path if path and path[0] == start else []
 
 
-def print_shortest_paths(G: nx.Graph, start: Any) -> None:
-    distances, previous = dijkstra(G, start)
+def print_shortest_paths(G: nx.Graph | CSRGraph, start: Any, cache: Optional[ShortestPathCache] = None) -> None:
+    distances, previous = cache.get(start) if cache is not None else dijkstra(G, start)
 
     print(f"\nНайкоротші шляхи від вершини '{start}':")
     print("-" * 60)
     print(f"{'До вершини':<15} {'Відстань':<15} {'Шлях':<30}")
     print("-" * 60)
-    for node in sorted(G.nodes, key=str):
-        d = distances.get(node, float('inf'))
+    # Один прохід по дереву: рядок шляху фіксується, поки спільний стек префіксів ще його містить
+    rows = []
+    for node, d, path in iter_shortest_paths(distances, previous, start):
         if d == float('inf'):
-            path_str = 'недоступна'; dist_str = '∞'
+            rows.append((str(node), '∞', 'недоступна'))
         else:
-            path = reconstruct_path(previous, start, node)
-            path_str = ' → '.join(map(str, path)); dist_str = str(d)
-        print(f"{str(node):<15} {dist_str:<15} {path_str:<30}")
+            rows.append((str(node), str(d), ' → '.join(map(str, path))))
+    rows.sort(key=itemgetter(0))
+    for name, dist_str, path_str in rows:
+        print(f"{name:<15} {dist_str:<15} {path_str:<30}")
     print("-" * 60)
 
 
+def iter_shortest_paths(distances: Dict[Any, float], previous: Dict[Any, Optional[Any]],
+                        start: Any) -> Iterator[Tuple[Any, float, List[Any]]]:
+    """Один DFS по дереву previous: (вершина, відстань, шлях), де шлях — спільний стек префіксів.
+
+    Список шляху дійсний лише до наступної ітерації (копіюйте, якщо треба зберегти);
+    недосяжні вершини йдуть наприкінці з порожнім шляхом.
+    """
+    children: Dict[Any, List[Any]] = {}
+    for node, parent in previous.items():
+        if parent is not None:
+            children.setdefault(parent, []).append(node)
+
+    path = [start]
+    yield start, distances[start], path
+    stack = [iter(children.get(start, ()))]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            path.pop()
+            continue
+        path.append(node)
+        yield node, distances[node], path
+        stack.append(iter(children.get(node, ())))
+
+    for node, d in distances.items():
+        if d == float('inf'):
+            yield node, d, []
+
+
+def write_shortest_paths(G: nx.Graph | CSRGraph, start: Any, out: TextIO, fmt: str = "text",
+                         cache: Optional[ShortestPathCache] = None, separator: str = " → ") -> int:
+    """Потоковий звіт найкоротших шляхів у out: fmt — "text", "csv" або "json" (JSON Lines); повертає к-сть рядків"""
+    distances, previous = cache.get(start) if cache is not None else dijkstra(G, start)
+    rows = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["node", "distance", "path"])
+    elif fmt == "text":
+        out.write(f"{'До вершини':<15} {'Відстань':<15} {'Шлях':<30}\n")
+    elif fmt != "json":
+        raise ValueError(f"Unknown report format '{fmt}'")
+
+    for node, d, path in iter_shortest_paths(distances, previous, start):
+        reachable = d != float('inf')
+        if fmt == "csv":
+            writer.writerow([node, d if reachable else "", separator.join(map(str, path))])
+        elif fmt == "json":
+            out.write(json.dumps({"node": node, "distance": d if reachable else None, "path": path},
+                                 ensure_ascii=False, default=str))
+            out.write("\n")
+        else:
+            path_str = separator.join(map(str, path)) if reachable else 'недоступна'
+            dist_str = str(d) if reachable else '∞'
+            out.write(f"{str(node):<15} {dist_str:<15} {path_str:<30}\n")
+        rows += 1
+    return rows
+
+
 def demo(G: nx.Graph, start: Any, title: str = "Демонстрація графа", layout: str = "spring") -> None:
     print("\n" + "=" * 60)
     print(title)
@@ -82,6 +1095,15 @@ def demo(G: nx.Graph, start: Any, title: str = "Демонстрація гра
 
 
 if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", action="store_true", help="Benchmark priority-queue strategies and exit")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark_queues()
+        sys.exit()
 
     G1 = nx.Graph()
     G1.add_weighted_edges_from([
@@ -106,5 +1128,13 @@ if __name__ == "__main__":
         ("3", "4", 6),
         ("4", "5", 9),
     ])
+    print("\nШлях A → E:")
+    print("  shortest_path:", shortest_path(G1, "A", "E"))
+    print("  bidirectional_dijkstra:", bidirectional_dijkstra(G1, "A", "E"))
+
+    ch = ContractionHierarchy.build(G2)
+    print("  ContractionHierarchy.query('0', '4'):", ch.query("0", "4"),
+          "| dijkstra:", dijkstra(G2, "0")[0]["4"])
+
     demo(G1, start="A", title="ПРИКЛАД 1")
     demo(G2, start="0", title="ПРИКЛАД 2")
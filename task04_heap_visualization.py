@@ -1,10 +1,22 @@
 import uuid
-import math
-from typing import List, Optional
+import random
+import time
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import heapq
-import networkx as nx
+import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
-from matplotlib import cm, colors as mpl_colors
+from matplotlib import colors as mpl_colors
+from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
+
+
+FAST_HEAP_THRESHOLD = 255
+ANIMATION_WRITERS = {".mp4": "ffmpeg", ".gif": "pillow"}
+PALETTE_CACHE_SIZE = 64
 
 
 class Node:
@@ -16,45 +28,310 @@ class Node:
         self.id = str(uuid.uuid4())
 
 
-def add_edges(graph: nx.DiGraph, node: Optional[Node], pos: dict, x=0.0, y=0.0, layer=1) -> nx.DiGraph:
-    if node is not None:
-        graph.add_node(node.id, color=node.color, label=node.val)
-        if node.left:
-            graph.add_edge(node.id, node.left.id)
-            l = x - 1 / (2 ** layer)
-            pos[node.left.id] = (l, y - 1)
-            add_edges(graph, node.left, pos, x=l, y=y - 1, layer=layer + 1)
-        if node.right:
-            graph.add_edge(node.id, node.right.id)
-            r = x + 1 / (2 ** layer)
-            pos[node.right.id] = (r, y - 1)
-            add_edges(graph, node.right, pos, x=r, y=y - 1, layer=layer + 1)
-    return graph
-
-
-def draw_tree(tree_root: Node, title: str = "Бінарне дерево") -> None:
-    tree = nx.DiGraph()
-    pos = {tree_root.id: (0.0, 0.0)}
-    add_edges(tree, tree_root, pos)
-
-    node_colors = [data["color"] for _, data in tree.nodes(data=True)]
-    labels = {node_id: data["label"] for node_id, data in tree.nodes(data=True)}
-
-    plt.figure(figsize=(9, 6))
-    plt.title(title)
-    nx.draw(tree, pos=pos, labels=labels, arrows=False, node_size=2000, node_color=node_colors)
-    plt.axis("off")
-    plt.show()
+def _tree_arrays(root: Node) -> Tuple[List[Node], List[int], List[int], List[int]]:
+    """Вузли в порядку BFS і списки індексів left/right/parent (-1 — немає)"""
+    nodes = [root]
+    left: List[int] = []
+    right: List[int] = []
+    parent = [-1]
+    for i, node in enumerate(nodes):
+        for child, side in ((node.left, left), (node.right, right)):
+            if child is None:
+                side.append(-1)
+            else:
+                side.append(len(nodes))
+                nodes.append(child)
+                parent.append(i)
+    return nodes, left, right, parent
+
+
+def tidy_layout(left: Sequence[int], right: Sequence[int], parent: Sequence[int],
+                distance: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Охайне розміщення бінарного дерева за Рейнгольдом–Тілфордом у варіанті Walker/Buchheim.
+
+    Вузли мають бути в порядку BFS (батько раніше за дітей). Без рекурсії і за O(n): контури
+    піддерев обходяться нитками, зсуви накопичуються в mod. Єдиний нащадок стоїть на distance / 2
+    зліва чи справа від батька. Повертає x, y (y = -глибина).
+    """
+    n = len(parent)
+    prelim = [0.0] * n
+    mod = [0.0] * n
+    thread = [-1] * n
+    half = distance / 2
+
+    def next_left(v: int) -> int:
+        return left[v] if left[v] >= 0 else (right[v] if right[v] >= 0 else thread[v])
+
+    def next_right(v: int) -> int:
+        return right[v] if right[v] >= 0 else (left[v] if left[v] >= 0 else thread[v])
+
+    # У зворотному BFS-порядку діти обробляються раніше за батьків
+    for v in range(n - 1, -1, -1):
+        lc, rc = left[v], right[v]
+        if lc < 0 and rc < 0:
+            continue
+        if lc < 0:
+            prelim[v] = prelim[rc] - half
+            continue
+        if rc < 0:
+            prelim[v] = prelim[lc] + half
+            continue
+
+        # Праве піддерево ставимо на distance правіше за ліве, потім розсуваємо по контурах
+        delta = prelim[lc] + distance - prelim[rc]
+        prelim[rc] += delta
+        mod[rc] += delta
+        vil, vir, vol, vor = lc, rc, lc, rc
+        sil, sir, sol, sor = mod[lc], mod[rc], mod[lc], mod[rc]
+        while next_right(vil) >= 0 and next_left(vir) >= 0:
+            vil, vir = next_right(vil), next_left(vir)
+            vol, vor = next_left(vol), next_right(vor)
+            shift = (prelim[vil] + sil) - (prelim[vir] + sir) + distance
+            if shift > 0:
+                prelim[rc] += shift
+                mod[rc] += shift
+                sir += shift
+                sor += shift
+            sil += mod[vil]
+            sir += mod[vir]
+            sol += mod[vol]
+            sor += mod[vor]
+        if next_right(vil) >= 0 and next_right(vor) < 0:
+            thread[vor] = next_right(vil)
+            mod[vor] += sil - sor
+        elif next_left(vir) >= 0 and next_left(vol) < 0:
+            thread[vol] = next_left(vir)
+            mod[vol] += sir - sol
+        prelim[v] = (prelim[lc] + prelim[rc]) / 2
+
+    x = np.empty(n)
+    depth = np.zeros(n)
+    offset = [0.0] * n
+    for v in range(n):
+        p = parent[v]
+        if p >= 0:
+            offset[v] = offset[p] + mod[p]
+            depth[v] = depth[p] + 1
+        x[v] = prelim[v] + offset[v]
+    return x, -depth
+
+
+def _edge_polyline(x: np.ndarray, y: np.ndarray, parent_idx: np.ndarray, child_idx: np.ndarray) -> np.ndarray:
+    """Ребра parent_idx → child_idx однією ламаною з NaN-розривами замість Path на кожне ребро"""
+    edges = np.full((child_idx.size, 3, 2), np.nan)
+    edges[:, 0, 0] = x[parent_idx]
+    edges[:, 0, 1] = y[parent_idx]
+    edges[:, 1, 0] = x[child_idx]
+    edges[:, 1, 1] = y[child_idx]
+    return edges.reshape(-1, 2)
+
+
+class ArrayTree:
+    """Компактне бінарне дерево: values, left, right, parent — масиви NumPy, вузол — його ціле id.
+
+    -1 означає відсутнього нащадка чи батька. Кольори не зберігаються у вузлах: їх передають
+    накладкою {id: колір} або RGBA-масивом за id.
+    """
+
+    def __init__(self, values, left, right, parent=None, root: int = 0):
+        self.values = np.asarray(values)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        if parent is None:
+            parent = np.full(self.left.size, -1, dtype=np.int64)
+            for children in (self.left, self.right):
+                has_child = children >= 0
+                parent[children[has_child]] = np.flatnonzero(has_child)
+        self.parent = np.asarray(parent, dtype=np.int64)
+        self.root = root if self.values.size else -1
+
+    def __len__(self) -> int:
+        return self.values.size
+
+    @classmethod
+    def from_node(cls, root: Optional[Node]) -> "ArrayTree":
+        """Перенумерація дерева з Node у порядку BFS: корінь отримує id 0"""
+        if root is None:
+            return cls([], [], [], [])
+        nodes, left, right, parent = _tree_arrays(root)
+        return cls([node.val for node in nodes], left, right, parent)
+
+    @classmethod
+    def from_heap(cls, heap: Sequence) -> "ArrayTree":
+        """Купа як дерево без жодного циклу Python: діти i — 2i + 1 та 2i + 2"""
+        n = len(heap)
+        idx = np.arange(n, dtype=np.int64)
+        left = np.where(2 * idx + 1 < n, 2 * idx + 1, -1)
+        right = np.where(2 * idx + 2 < n, 2 * idx + 2, -1)
+        return cls(heap, left, right, (idx - 1) // 2)
+
+    def to_node(self) -> Optional[Node]:
+        if self.root < 0:
+            return None
+        nodes = [Node(value) for value in self.values.tolist()]
+        for node, li, ri in zip(nodes, self.left.tolist(), self.right.tolist()):
+            if li >= 0:
+                node.left = nodes[li]
+            if ri >= 0:
+                node.right = nodes[ri]
+        return nodes[self.root]
+
+    def depths(self) -> np.ndarray:
+        """Глибини всіх вузлів подвоєнням стрибків до предків: O(n log h) у векторних операціях"""
+        depth = (self.parent >= 0).astype(np.int64)
+        jump = self.parent.copy()
+        while True:
+            alive = np.flatnonzero(jump >= 0)
+            if alive.size == 0:
+                return depth
+            ancestor = jump[alive]
+            depth[alive] += depth[ancestor]
+            jump[alive] = jump[ancestor]
+
+    def levels(self) -> Iterator[np.ndarray]:
+        """id вузлів рівень за рівнем, зліва направо; одна пара векторних операцій на рівень"""
+        level = np.array([self.root] if self.root >= 0 else [], dtype=np.int64)
+        while level.size:
+            yield level
+            children = np.column_stack((self.left[level], self.right[level])).ravel()
+            level = children[children >= 0]
+
+    def level_order(self) -> np.ndarray:
+        parts = list(self.levels())
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+def _level_order_arrays(tree: ArrayTree) -> Tuple[np.ndarray, List[int], List[int], List[int]]:
+    """Порядок BFS і left/right/parent, перенумеровані в цьому порядку, — вхід для tidy_layout"""
+    order = tree.level_order()
+    rank = np.full(len(tree) + 1, -1, dtype=np.int64)
+    rank[order] = np.arange(order.size)
+    # Індекс -1 потрапляє на останній елемент rank, який лишається -1
+    return order, rank[tree.left[order]].tolist(), rank[tree.right[order]].tolist(), rank[tree.parent[order]].tolist()
+
+
+def draw_tree(tree_root: Union[Node, ArrayTree], title: str = "Бінарне дерево", colors=None, ax=None,
+              label_limit: int = 255) -> None:
+    """colors — накладка кольорів, що має перевагу над node.color і не змінює дерево: {вузол: колір}
+    для Node, {id: колір} або RGBA-масив за id для ArrayTree; з ax малює в наявні осі без нового вікна,
+    тож кілька накладок одного дерева стають поруч"""
+    if isinstance(tree_root, ArrayTree):
+        order, left, right, parent = _level_order_arrays(tree_root)
+        labels = tree_root.values[order]
+        if colors is None:
+            node_colors = np.broadcast_to(mpl_colors.to_rgba("skyblue"), (order.size, 4))
+        elif isinstance(colors, Mapping):
+            node_colors = mpl_colors.to_rgba_array([colors.get(i, "skyblue") for i in order.tolist()])
+        else:
+            node_colors = np.asarray(colors)[order]
+    else:
+        nodes, left, right, parent = _tree_arrays(tree_root)
+        labels = [node.val for node in nodes]
+        overlay = colors or {}
+        node_colors = mpl_colors.to_rgba_array([overlay.get(node, node.color) for node in nodes])
+    n = len(parent)
+    if n == 0:
+        return
+    x, y = tidy_layout(left, right, parent)
+
+    show = ax is None
+    if show:
+        plt.figure(figsize=(9, 6))
+        ax = plt.gca()
+    ax.set_title(title)
+    ax.axis("off")
+    ax.set_xlim(x.min() - 0.6, x.max() + 0.6)
+    ax.set_ylim(y.min() - 0.6, 0.6)
+
+    # Діаметр вузла — не більше 2000 pt² (як раніше) і не ширше за одиницю сітки розміщення
+    box = ax.get_window_extent()
+    points_per_px = 72 / ax.figure.dpi
+    unit = min(box.width / (x.max() - x.min() + 1.2), box.height / (-y.min() + 1.2)) * points_per_px
+    node_size = min(2000.0, (0.8 * unit) ** 2)
+
+    edges = _edge_polyline(x, y, np.asarray(parent[1:], dtype=np.int64), np.arange(1, n))
+    ax.add_collection(LineCollection([edges], colors="black", linewidths=1.0, zorder=1), autolim=False)
+    ax.scatter(x, y, s=node_size, c=node_colors, linewidths=0, zorder=2)
+    if n <= label_limit:
+        fontsize = min(12.0, 0.45 * unit)
+        for xi, yi, label in zip(x, y, labels):
+            ax.text(xi, yi, str(label), ha="center", va="center", fontsize=fontsize, zorder=3)
+    if show:
+        plt.show()
+
+
+@lru_cache(maxsize=PALETTE_CACHE_SIZE)
+def _palette(cmap_name: str, start: float, end: float, count: int) -> np.ndarray:
+    return _palette_table(matplotlib.colormaps[cmap_name], start, end, count)
+
+
+@lru_cache(maxsize=PALETTE_CACHE_SIZE)
+def _palette_hex(cmap_name: str, start: float, end: float, count: int) -> Tuple[str, ...]:
+    return _hex_table(_palette(cmap_name, start, end, count))
+
+
+def _palette_table(cmap: mpl_colors.Colormap, start: float, end: float, count: int) -> np.ndarray:
+    rgba = cmap(np.linspace(start, end, count))
+    rgba.flags.writeable = False
+    return rgba
+
+
+def _hex_table(rgba: np.ndarray) -> Tuple[str, ...]:
+    rgb = np.rint(rgba[:, :3] * 255).astype(np.uint8)
+    return tuple("#" + row.tobytes().hex() for row in rgb)
+
+
+# id(карти) -> (карта, ім'я або None): карта тримається, щоб її id не перевикористали
+_registered_names: dict = {}
+
+
+def _registered_name(cmap: Union[str, mpl_colors.Colormap]) -> Optional[str]:
+    """Колірні карти не хешуються, тож ключ кешу — ім'я зареєстрованої карти; None для власних карт.
+
+    Порівняння з реєстром копіює й звіряє всю таблицю карти, тому відповідь запам'ятовується.
+    """
+    if isinstance(cmap, str):
+        return cmap
+    known = _registered_names.get(id(cmap))
+    if known is not None and known[0] is cmap:
+        return known[1]
+    name = cmap.name if matplotlib.colormaps.get(cmap.name) == cmap else None
+    if len(_registered_names) >= PALETTE_CACHE_SIZE:
+        _registered_names.clear()
+    _registered_names[id(cmap)] = (cmap, name)
+    return name
+
+
+def palette(cmap: Union[str, mpl_colors.Colormap], count: int, start: float = 0.0, end: float = 1.0) -> np.ndarray:
+    """count RGBA-кольорів рівномірно від start до end колірної карти — одна таблиця (count, 4) на всіх.
+
+    Таблиці зареєстрованих карт кешуються за (ім'я, start, end, count) з LRU-витісненням і спільні
+    між викликами, тому масив лише для читання: індексуйте його, а не змінюйте на місці.
+    """
+    if count <= 0:
+        return np.empty((0, 4))
+    name = _registered_name(cmap)
+    if name is None:
+        return _palette_table(cmap, start, end, count)
+    return _palette(name, float(start), float(end), count)
+
+
+def palette_hex(cmap: Union[str, mpl_colors.Colormap], count: int, start: float = 0.0, end: float = 1.0) -> Tuple[str, ...]:
+    """Та сама таблиця, що й palette, але hex-рядками — для API, яким потрібен колір на вузол"""
+    if count <= 0:
+        return ()
+    name = _registered_name(cmap)
+    if name is None:
+        return _hex_table(_palette_table(cmap, start, end, count))
+    return _palette_hex(name, float(start), float(end), count)
 
 
 def _depth_color(index: int, max_index: int) -> str:
     if max_index < 0:
         return "#87ceeb"
-    max_depth = int(math.log2(max_index + 1))
-    depth = int(math.log2(index + 1)) if index >= 0 else 0
-    t = depth / max(1, max_depth)
-    rgba = cm.Reds(0.3 + 0.7 * t) 
-    return mpl_colors.to_hex(rgba)
+    max_depth = (max_index + 1).bit_length() - 1
+    depth = (index + 1).bit_length() - 1 if index >= 0 else 0
+    return palette_hex("Reds", max_depth + 1, 0.3, 1.0)[depth]
 
 
 def heap_to_tree(heap: List[int], use_depth_colors: bool = True) -> Optional[Node]:
@@ -63,8 +340,9 @@ def heap_to_tree(heap: List[int], use_depth_colors: bool = True) -> Optional[Nod
     n = len(heap)
     nodes = [Node(heap[i]) for i in range(n)]
     if use_depth_colors:
+        colors = palette_hex("Reds", n.bit_length(), 0.3, 1.0)
         for i in range(n):
-            nodes[i].color = _depth_color(i, n - 1)
+            nodes[i].color = colors[(i + 1).bit_length() - 1]
     for i in range(n):
         li = 2 * i + 1
         ri = 2 * i + 2
@@ -75,7 +353,391 @@ def heap_to_tree(heap: List[int], use_depth_colors: bool = True) -> Optional[Nod
     return nodes[0]
 
 
-def visualize_heap(heap: List[int], title: str = "Візуалізація бінарної купи") -> None:
+def heap_positions(n: int):
+    """Координати вузлів купи за індексом: depth = floor(log2(i + 1)), x — середина своєї частки рівня"""
+    idx = np.arange(1, n + 1, dtype=np.float64)
+    _, exponent = np.frexp(idx)
+    depth = exponent - 1
+    level_size = np.ldexp(1.0, depth)
+    x = (idx - level_size + 0.5) / level_size
+    return x, -depth.astype(np.float64)
+
+
+def _depth_colors(n: int) -> np.ndarray:
+    """RGBA-масив тих самих кольорів, що й _depth_color, для всіх n вузлів одразу"""
+    if n <= 0:
+        return np.empty((0, 4))
+    _, exponent = np.frexp(np.arange(1, n + 1, dtype=np.float64))
+    return palette("Reds", n.bit_length(), 0.3, 1.0)[exponent - 1]
+
+
+def _heap_edge_paths(x: np.ndarray, y: np.ndarray, width_px: float) -> List[np.ndarray]:
+    """Ребра кожного рівня — одна ламана з NaN-розривами; рівні, ширші за width_px пікселів, пропускаються"""
+    n = x.size
+    max_depth = int(-y[-1]) if n else 0
+    paths = []
+    for depth in range(1, max_depth + 1):
+        if 2 ** depth > width_px:
+            break
+        child = np.arange(2 ** depth - 1, min(2 ** (depth + 1) - 1, n))
+        paths.append(_edge_polyline(x, y, (child - 1) // 2, child))
+    return paths
+
+
+def draw_heap_array(heap: List[int], title: str = "Візуалізація бінарної купи", label_limit: int = 63) -> None:
+    """Рендер купи прямо з масиву: позиції в замкненій формі, по одному артисту на рівень.
+
+    Ребра рівнів, ширших за вісь у пікселях, не малюються: там вони однаково зливаються у суцільну смугу.
+    """
+    n = len(heap)
+    x, y = heap_positions(n)
+    max_depth = int(-y[-1]) if n else 0
+    colors = _depth_colors(n)
+
+    fig, ax = plt.subplots(figsize=(9, 6))
+    ax.set_title(title)
+    ax.set_xlim(-0.02, 1.02)
+    ax.set_ylim(-max_depth - 0.5, 0.5)
+    ax.axis("off")
+    width_px = ax.get_window_extent().width
+    labelled = n <= label_limit
+    markersize = 45 if labelled else max(45 / 2 ** (max_depth / 2), 1.0)
+
+    for depth in range(max_depth + 1):
+        lo, hi = 2 ** depth - 1, min(2 ** (depth + 1) - 1, n)
+        # Колір у межах рівня однаковий, тож вузли рівня — одна лінія з маркерами
+        ax.plot(x[lo:hi], y[lo:hi], linestyle="none", marker="o", markersize=markersize,
+                color=colors[lo], markeredgewidth=0, zorder=2)
+    edge_paths = _heap_edge_paths(x, y, width_px)
+    ax.add_collection(LineCollection(edge_paths, colors="black", linewidths=1.0 if labelled else 0.3, zorder=1))
+
+    if labelled:
+        for xi, yi, value in zip(x, y, heap):
+            ax.text(xi, yi, str(value), ha="center", va="center", fontsize=12, zorder=3)
+    plt.show()
+
+
+class IndexedDaryHeap:
+    """Індексована d-арна мін-купа на масивах: keys/items у порядку купи, pos — позиція кожного елемента.
+
+    Зі trace=True кожна зміна масиву пишеться у self.trace кортежами ("push", key), ("pop",),
+    ("remove", i), ("set", i, key), ("swap", i, j) — їх відтворює replay_trace.
+    """
+
+    def __init__(self, arity: int = 2, trace: bool = False):
+        if arity < 2:
+            raise ValueError("Heap arity must be at least 2")
+        self.arity = arity
+        self.keys: List = []
+        self.items: List = []
+        self.pos: dict = {}
+        self.trace: Optional[List[tuple]] = [] if trace else None
+
+    @classmethod
+    def heapify(cls, pairs: Iterable[Tuple[Any, Any]], arity: int = 2, trace: bool = False) -> "IndexedDaryHeap":
+        """Побудова знизу вгору за O(n) з пар (елемент, ключ)"""
+        heap = cls(arity, trace)
+        heap.push_many(pairs)
+        return heap
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item) -> bool:
+        return item in self.pos
+
+    def peek(self) -> Tuple[Any, Any]:
+        return self.items[0], self.keys[0]
+
+    def key(self, item):
+        return self.keys[self.pos[item]]
+
+    def push(self, item, key) -> None:
+        if item in self.pos:
+            raise ValueError(f"Item {item!r} is already in the heap")
+        i = len(self.items)
+        self.keys.append(key)
+        self.items.append(item)
+        self.pos[item] = i
+        if self.trace is not None:
+            self.trace.append(("push", key))
+        self._sift_up(i)
+
+    def push_many(self, pairs: Iterable[Tuple[Any, Any]]) -> None:
+        """Масове додавання: дописати в кінець і відновити купу просіюванням знизу вгору"""
+        start = len(self.items)
+        for item, key in pairs:
+            if item in self.pos:
+                raise ValueError(f"Item {item!r} is already in the heap")
+            self.pos[item] = len(self.items)
+            self.keys.append(key)
+            self.items.append(item)
+            if self.trace is not None:
+                self.trace.append(("push", key))
+        n = len(self.items)
+        added = n - start
+        if added == 0:
+            return
+        if added * 4 < start:
+            for i in range(start, n):
+                self._sift_up(i)
+            return
+        for i in reversed(range((n - 2) // self.arity + 1)):
+            self._sift_down(i)
+
+    def pop(self) -> Tuple[Any, Any]:
+        if not self.items:
+            raise IndexError("pop from an empty heap")
+        item, key = self.items[0], self.keys[0]
+        if self.trace is not None:
+            self.trace.append(("pop",))
+        self._detach(0)
+        return item, key
+
+    def remove(self, item):
+        """Видалення довільного елемента за O(d · log_d n); повертає його ключ"""
+        i = self.pos[item]
+        key = self.keys[i]
+        if self.trace is not None:
+            self.trace.append(("remove", i))
+        self._detach(i)
+        return key
+
+    def decrease_key(self, item, key) -> None:
+        i = self.pos[item]
+        if key > self.keys[i]:
+            raise ValueError("New key is greater than the current key")
+        self.keys[i] = key
+        if self.trace is not None:
+            self.trace.append(("set", i, key))
+        self._sift_up(i)
+
+    def _detach(self, i: int) -> None:
+        """Останній елемент займає місце i, після чого просіюється в потрібний бік"""
+        keys, items = self.keys, self.items
+        del self.pos[items[i]]
+        last_key, last_item = keys.pop(), items.pop()
+        if i == len(items):
+            return
+        keys[i], items[i] = last_key, last_item
+        self.pos[last_item] = i
+        if i and last_key < keys[(i - 1) // self.arity]:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def _sift_up(self, i: int) -> None:
+        keys, items, pos, d, trace = self.keys, self.items, self.pos, self.arity, self.trace
+        key, item = keys[i], items[i]
+        while i > 0:
+            parent = (i - 1) // d
+            if not key < keys[parent]:
+                break
+            keys[i] = keys[parent]
+            items[i] = items[parent]
+            pos[items[i]] = i
+            if trace is not None:
+                trace.append(("swap", i, parent))
+            i = parent
+        keys[i], items[i] = key, item
+        pos[item] = i
+
+    def _sift_down(self, i: int) -> None:
+        keys, items, pos, d, trace = self.keys, self.items, self.pos, self.arity, self.trace
+        n = len(items)
+        key, item = keys[i], items[i]
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            best = first
+            best_key = keys[first]
+            for child in range(first + 1, min(first + d, n)):
+                if keys[child] < best_key:
+                    best, best_key = child, keys[child]
+            if not best_key < key:
+                break
+            keys[i] = best_key
+            items[i] = items[best]
+            pos[items[i]] = i
+            if trace is not None:
+                trace.append(("swap", i, best))
+            i = best
+        keys[i], items[i] = key, item
+        pos[item] = i
+
+
+def _apply_op(state: List, op: tuple) -> None:
+    """Одна операція журналу над масивом ключів на місці"""
+    kind = op[0]
+    if kind == "swap":
+        _, i, j = op
+        state[i], state[j] = state[j], state[i]
+    elif kind == "push":
+        state.append(op[1])
+    elif kind == "set":
+        state[op[1]] = op[2]
+    else:
+        i = 0 if kind == "pop" else op[1]
+        last = state.pop()
+        if i < len(state):
+            state[i] = last
+
+
+def replay_trace(keys: List, trace: Iterable[tuple]) -> Iterator[Tuple[tuple, List]]:
+    """Відтворення trace над копією масиву ключів; після кожної операції — (операція, поточний масив)"""
+    state = list(keys)
+    for op in trace:
+        _apply_op(state, op)
+        yield op, state
+
+
+def benchmark_heaps(n: int = 100_000, ops: int = 200_000, arities: Sequence[int] = (2, 4, 8)) -> None:
+    """Планувальник: купа на n задач, потім ops циклів pop + push — heapq проти IndexedDaryHeap"""
+    rng = random.Random(0)
+    initial = [(i, rng.random()) for i in range(n)]
+    keys = [rng.random() for _ in range(ops)]
+
+    start = time.perf_counter()
+    heap = [(key, item) for item, key in initial]
+    heapq.heapify(heap)
+    for key in keys:
+        _, item = heapq.heappop(heap)
+        heapq.heappush(heap, (key, item))
+    print(f"{'heapq':<12} {time.perf_counter() - start:>8.3f} с")
+
+    for arity in arities:
+        start = time.perf_counter()
+        dheap = IndexedDaryHeap.heapify(initial, arity=arity)
+        for key in keys:
+            item, _ = dheap.pop()
+            dheap.push(item, key)
+        print(f"{f'{arity}-арна':<12} {time.perf_counter() - start:>8.3f} с")
+
+
+def _trace_touches(op: tuple, size: int) -> Tuple[int, ...]:
+    """Індекси слотів, які змінює операція над купою розміру size (до її застосування)"""
+    kind = op[0]
+    if kind == "swap":
+        return op[1], op[2]
+    if kind == "push":
+        return (size,)
+    if kind == "set":
+        return (op[1],)
+    i = 0 if kind == "pop" else op[1]
+    return i, size - 1
+
+
+def animate_heap(fig, ax, heap: List, trace: Sequence[tuple], interval: int = 50,
+                 ops_per_frame: int = 1, label_limit: int = 63) -> FuncAnimation:
+    """Анімація журналу IndexedDaryHeap (бінарної) поверх heap.
+
+    Усі слоти під найбільший розмір купи малюються один раз і потрапляють у фон blit; кожен кадр
+    перемальовує лише накладку з торкнутих слотів і слотів, чия зайнятість відрізняється від початкової.
+    """
+    if ops_per_frame < 1:
+        raise ValueError(f"ops_per_frame must be at least 1, got {ops_per_frame}")
+    initial_size = size = max_size = len(heap)
+    for op in trace:
+        if op[0] == "push":
+            size += 1
+            max_size = max(max_size, size)
+        elif op[0] in ("pop", "remove"):
+            size -= 1
+
+    x, y = heap_positions(max_size)
+    max_depth = int(-y[-1]) if max_size else 0
+    ax.set_xlim(-0.02, 1.02)
+    ax.set_ylim(-max_depth - 0.5, 0.5)
+    ax.axis("off")
+    labelled = max_size <= label_limit
+    markersize = 45 if labelled else max(45 / 2 ** (max_depth / 2), 1.0)
+    ax.add_collection(LineCollection(_heap_edge_paths(x, y, ax.get_window_extent().width),
+                                     colors="lightgray", linewidths=1.0 if labelled else 0.3, zorder=1),
+                      autolim=False)
+
+    base = _depth_colors(max_size)
+    empty = mpl_colors.to_rgba("lightgray", alpha=0.2)
+    highlight = np.array(mpl_colors.to_rgba("gold"))
+    background = base.copy()
+    background[initial_size:] = empty
+    ax.scatter(x, y, s=markersize ** 2, c=background, linewidths=0, zorder=2)
+    overlay = ax.scatter([], [], s=markersize ** 2, linewidths=0, zorder=2.5)
+    texts = [ax.text(xi, yi, "", ha="center", va="center", fontsize=12, zorder=3) for xi, yi in zip(x, y)] \
+        if labelled else []
+    status = ax.text(0.0, 0.3, "", ha="left", va="center", fontsize=10)
+    artists = [overlay, *texts, status]
+    state: dict = {}
+
+    def init():
+        state["keys"] = list(heap)
+        state["ops"] = iter(trace)
+        state["done"] = 0
+        overlay.set_offsets(np.empty((0, 2)))
+        for text, value in zip(texts, heap):
+            text.set_text(str(value))
+        status.set_text("")
+        return artists
+
+    def update(frame: int):
+        keys = state["keys"]
+        touched = set()
+        batch = list(islice(state["ops"], ops_per_frame))
+        for op in batch:
+            touched.update(_trace_touches(op, len(keys)))
+            _apply_op(keys, op)
+        state["done"] += len(batch)
+        n = len(keys)
+        for i in touched:
+            if texts:
+                texts[i].set_text(str(keys[i]) if i < n else "")
+
+        # Слоти між початковим і поточним розміром змінили зайнятість відносно фону
+        drift = np.arange(min(n, initial_size), max(n, initial_size))
+        hot = np.fromiter(touched, dtype=np.intp, count=len(touched))
+        idx = np.concatenate((drift, hot))
+        colors = np.where((idx < n)[:, None], base[idx], empty)
+        colors[drift.size:][hot < n] = highlight
+        overlay.set_offsets(np.column_stack((x[idx], y[idx])))
+        overlay.set_facecolors(colors)
+        if batch:
+            status.set_text(f"{state['done']}/{len(trace)}: {batch[-1][0]}")
+        return artists
+
+    # Порожній журнал — один кадр із початковою купою, щоб запис у файл не лишився без кадрів
+    frames = max(1, -(-len(trace) // ops_per_frame))
+    return FuncAnimation(fig, update, frames=frames, init_func=init, interval=interval, blit=True, repeat=False)
+
+
+def render_heap_animation(output: str, heap: List, trace: Sequence[tuple], fps: int = 20,
+                          ops_per_frame: int = 1, title: str = "Операції над купою") -> None:
+    """Запис анімації у .mp4/.gif без вікна"""
+    suffix = Path(output).suffix.lower()
+    if suffix not in ANIMATION_WRITERS:
+        raise ValueError(f"Unsupported animation format {suffix!r}; use one of {sorted(ANIMATION_WRITERS)}")
+    fig, ax = plt.subplots(figsize=(9, 6))
+    ax.set_title(title)
+    try:
+        anim = animate_heap(fig, ax, heap, trace, ops_per_frame=ops_per_frame)
+        anim.save(output, writer=ANIMATION_WRITERS[suffix], fps=fps)
+    finally:
+        plt.close(fig)
+
+
+def visualize_heap(heap: List[int], title: str = "Візуалізація бінарної купи", fast: Optional[bool] = None,
+                   trace: Optional[Iterable[tuple]] = None) -> None:
+    """fast=None — для куп, більших за FAST_HEAP_THRESHOLD, малювати з масиву без дерева Node;
+    trace — журнал IndexedDaryHeap (бінарної), що відтворюється над heap перед малюванням"""
+    if trace is not None:
+        state = heap
+        for _, state in replay_trace(heap, trace):
+            pass
+        heap = list(state)
+    if fast is None:
+        fast = len(heap) > FAST_HEAP_THRESHOLD
+    if fast and heap:
+        draw_heap_array(heap, title=title)
+        return
     root = heap_to_tree(heap, use_depth_colors=True)
     if root is None:
         plt.figure(figsize=(6, 4))
@@ -88,6 +750,43 @@ def visualize_heap(heap: List[int], title: str = "Візуалізація бі
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", action="store_true", help="Benchmark IndexedDaryHeap against heapq and exit")
+    parser.add_argument("--animate", type=int, metavar="OPS",
+                        help="Animate OPS random push/pop operations on a traced heap")
+    parser.add_argument("--size", type=int, default=15, help="Initial heap size for --animate")
+    parser.add_argument("--ops-per-frame", type=int, default=1, help="Trace operations applied per animation frame")
+    parser.add_argument("--output", "-o", help="Save the --animate run headless to file.mp4|gif instead of a window")
+    args = parser.parse_args()
+    if args.ops_per_frame < 1:
+        parser.error("--ops-per-frame must be at least 1")
+    if args.animate is not None and args.animate < 0:
+        parser.error("--animate needs a non-negative number of operations")
+    if args.bench:
+        benchmark_heaps()
+        raise SystemExit
+    if args.animate is not None:
+        if args.output:
+            plt.switch_backend("Agg")
+        rng = random.Random(0)
+        traced = IndexedDaryHeap.heapify(((i, rng.randint(1, 99)) for i in range(args.size)), trace=True)
+        initial = list(traced.keys)
+        traced.trace.clear()
+        for i in range(args.size, args.size + args.animate):
+            if traced and rng.random() < 0.5:
+                traced.pop()
+            else:
+                traced.push(i, rng.randint(1, 99))
+        if args.output:
+            render_heap_animation(args.output, initial, traced.trace, ops_per_frame=args.ops_per_frame)
+        else:
+            fig, ax = plt.subplots(figsize=(9, 6))
+            ax.set_title("Операції над купою")
+            anim = animate_heap(fig, ax, initial, traced.trace, ops_per_frame=args.ops_per_frame)
+            plt.show()
+        raise SystemExit
 
     lh= [3, 8, 5, 10, 1, 2, 16, 12, 15, 18, 20, 25, 30, 4, 6]
     heapq.heapify(lh)
@@ -1,87 +1,237 @@
 from collections import deque
-from typing import Callable, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from task04_heap_visualization import Node, draw_tree
+import numpy as np
+from task04_heap_visualization import ArrayTree, Node, draw_tree, palette
+import matplotlib.pyplot as plt
 from matplotlib import cm, colors as mpl_colors
 
 
-TraversalFn = Callable[[Optional[Node]], List[Node]]
+TraversalFn = Callable[[Optional[Node]], Iterable[Node]]
+PREORDER_LEVEL_WIDTH = 64
 
 
-def _generate_gradient_colors(count: int, start: float = 0.25, end: float = 0.9, cmap=cm.Blues) -> List[str]:
-    if count <= 0:
-        return []
-    step = end - start
-    denom = max(1, count - 1)
-    return [mpl_colors.to_hex(cmap(start + step * (i / denom))) for i in range(count)]
+def _generate_gradient_colors(count: int, start: float = 0.25, end: float = 0.9, cmap=cm.Blues) -> np.ndarray:
+    """RGBA-масив (count, 4) зі спільного кешу палітр — лише для читання"""
+    return palette(cmap, count, start, end)
 
 
-def _clone_tree(root: Optional[Node]) -> Optional[Node]:
-    if root is None:
-        return None
-    root_clone = Node(root.val)
-    queue = deque([(root, root_clone)])
-    while queue:
-        original, clone = queue.popleft()
-        if original.left:
-            clone_left = Node(original.left.val)
-            clone.left = clone_left
-            queue.append((original.left, clone_left))
-        if original.right:
-            clone_right = Node(original.right.val)
-            clone.right = clone_right
-            queue.append((original.right, clone_right))
-    return root_clone
-
-
-def bfs_traversal(root: Optional[Node]) -> List[Node]:
-    order: List[Node] = []
+def iter_bfs(root: Optional[Node]) -> Iterator[Node]:
+    """Лінивий обхід у ширину: пам'ять — лише черга поточного фронту"""
     if root is None:
-        return order
+        return
     queue: deque[Node] = deque([root])
     while queue:
         node = queue.popleft()
-        order.append(node)
+        yield node
         if node.left:
             queue.append(node.left)
         if node.right:
             queue.append(node.right)
-    return order
 
 
-def dfs_traversal(root: Optional[Node]) -> List[Node]:
-    order: List[Node] = []
+def iter_levels(root: Optional[Node]) -> Iterator[List[Node]]:
+    """Рівні дерева по одному списку за раз"""
+    level = [root] if root is not None else []
+    while level:
+        yield level
+        level = [child for node in level for child in (node.left, node.right) if child is not None]
+
+
+def iter_preorder(root: Optional[Node]) -> Iterator[Node]:
+    """Прямий порядок (корінь, ліве, праве) на явному стеку глибиною до висоти дерева"""
     if root is None:
-        return order
+        return
     stack: List[Node] = [root]
     while stack:
         node = stack.pop()
-        order.append(node)
+        yield node
         if node.right:
             stack.append(node.right)
         if node.left:
             stack.append(node.left)
+
+
+def iter_inorder(root: Optional[Node]) -> Iterator[Node]:
+    """Симетричний порядок (ліве, корінь, праве)"""
+    stack: List[Node] = []
+    node = root
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+def iter_postorder(root: Optional[Node]) -> Iterator[Node]:
+    """Зворотний порядок (ліве, праве, корінь): вузол видається, коли з нього повернулися праворуч"""
+    stack: List[Node] = []
+    node = root
+    last: Optional[Node] = None
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        top = stack[-1]
+        if top.right is not None and top.right is not last:
+            node = top.right
+        else:
+            last = stack.pop()
+            yield last
+
+
+def _morris_step(node: Node, preorder: bool) -> Tuple[Optional[Node], Optional[Node]]:
+    """Один крок обходу Морріса: (вузол до видачі або None, наступний поточний вузол)"""
+    if node.left is None:
+        return node, node.right
+    pred = node.left
+    while pred.right is not None and pred.right is not node:
+        pred = pred.right
+    if pred.right is None:
+        pred.right = node
+        return (node if preorder else None), node.left
+    pred.right = None
+    return (None if preorder else node), node.right
+
+
+def _morris(root: Optional[Node], preorder: bool) -> Iterator[Node]:
+    node = root
+    try:
+        while node is not None:
+            visit, node = _morris_step(node, preorder)
+            if visit is not None:
+                yield visit
+    finally:
+        # Перерваний обхід лишив би нитки в right; дохід до кінця без видачі їх знімає
+        while node is not None:
+            _, node = _morris_step(node, preorder)
+
+
+def morris_inorder(root: Optional[Node]) -> Iterator[Node]:
+    """Симетричний обхід Морріса без стека й черги, O(1) додаткової пам'яті.
+
+    Поки обхід триває, right деяких вузлів тимчасово вказує на предка; після завершення
+    або закриття генератора дерево відновлюється.
+    """
+    return _morris(root, preorder=False)
+
+
+def morris_preorder(root: Optional[Node]) -> Iterator[Node]:
+    """Прямий обхід Морріса; ті самі застереження, що й у morris_inorder"""
+    return _morris(root, preorder=True)
+
+
+def find_node(root: Optional[Node], predicate: Callable[[Node], bool], traversal: TraversalFn = iter_bfs) -> Optional[Node]:
+    """Перший вузол у порядку traversal, що задовольняє predicate; обхід зупиняється одразу на ньому"""
+    for node in traversal(root):
+        if predicate(node):
+            return node
+    return None
+
+
+def array_preorder(tree: ArrayTree) -> np.ndarray:
+    """Прямий обхід ArrayTree.
+
+    Для невисоких дерев — векторно по рівнях: розміри піддерев знизу вгору, потім позиція вузла =
+    позиція батька + 1 (+ розмір лівого брата для правого нащадка). Для високих і вузьких дерев
+    векторні операції на рівень не окупаються, тож працює стек цілих id.
+    """
+    if tree.root < 0:
+        return np.empty(0, dtype=np.int64)
+    levels = list(tree.levels())
+    if len(levels) * PREORDER_LEVEL_WIDTH > len(tree):
+        return _array_preorder_stack(tree)
+
+    # Зайвий останній елемент — нуль для індексу -1 відсутнього нащадка
+    size = np.zeros(len(tree) + 1, dtype=np.int64)
+    for level in reversed(levels):
+        size[level] = 1 + size[tree.left[level]] + size[tree.right[level]]
+    position = np.zeros(len(tree), dtype=np.int64)
+    for level in levels[:-1]:
+        left, right = tree.left[level], tree.right[level]
+        has_left, has_right = left >= 0, right >= 0
+        position[left[has_left]] = position[level[has_left]] + 1
+        position[right[has_right]] = position[level[has_right]] + 1 + size[left[has_right]]
+    ids = np.concatenate(levels)
+    order = np.empty(ids.size, dtype=np.int64)
+    order[position[ids]] = ids
     return order
 
 
-def _apply_colors(order: Iterable[Node], cmap=cm.Blues) -> List[str]:
+def _array_preorder_stack(tree: ArrayTree) -> np.ndarray:
+    left, right = tree.left.tolist(), tree.right.tolist()
+    order: List[int] = []
+    visit = order.append
+    stack = [tree.root]
+    push, pop = stack.append, stack.pop
+    while stack:
+        v = pop()
+        visit(v)
+        if right[v] >= 0:
+            push(right[v])
+        if left[v] >= 0:
+            push(left[v])
+    return np.array(order, dtype=np.int64)
+
+
+def bfs_traversal(root: Union[Node, ArrayTree, None]) -> Union[List[Node], np.ndarray]:
+    """Для ArrayTree — масив id у порядку BFS (векторно, рівень за рівнем)"""
+    if isinstance(root, ArrayTree):
+        return root.level_order()
+    return list(iter_bfs(root))
+
+
+def dfs_traversal(root: Union[Node, ArrayTree, None]) -> Union[List[Node], np.ndarray]:
+    """Для ArrayTree — масив id у прямому порядку"""
+    if isinstance(root, ArrayTree):
+        return array_preorder(root)
+    return list(iter_preorder(root))
+
+
+def traversal_overlay(order: Iterable[Node], cmap=cm.Blues) -> Dict[Node, np.ndarray]:
+    """Накладка {вузол: RGBA} за порядком відвідування — для draw_tree(colors=...), дерево не змінюється"""
     order_list = list(order)
-    colors = _generate_gradient_colors(len(order_list), cmap=cmap)
-    for node, color in zip(order_list, colors):
-        node.color = color
+    return dict(zip(order_list, _generate_gradient_colors(len(order_list), cmap=cmap)))
+
+
+def array_traversal_colors(tree: ArrayTree, order: np.ndarray, cmap=cm.Blues) -> np.ndarray:
+    """RGBA-масив за id для draw_tree: градієнт у порядку order, решта вузлів — skyblue"""
+    colors = np.empty((len(tree), 4))
+    colors[:] = mpl_colors.to_rgba("skyblue")
+    colors[order] = _generate_gradient_colors(order.size, cmap=cmap)
     return colors
 
 
-def visualize_traversal(root: Optional[Node], traversal: TraversalFn, title: str, cmap=cm.Blues) -> List[int]:
-    cloned = _clone_tree(root)
-    if cloned is None:
+def visualize_traversal(root: Union[Node, ArrayTree, None], traversal: TraversalFn, title: str, cmap=cm.Blues) -> List:
+    if isinstance(root, ArrayTree):
+        order = np.asarray(traversal(root), dtype=np.int64)
+        draw_tree(root, title=title, colors=array_traversal_colors(root, order, cmap=cmap))
+        return root.values[order].tolist()
+    if root is None:
         return []
-    order = traversal(cloned)
-    _apply_colors(order, cmap=cmap)
-    draw_tree(cloned, title=title)
+    order = list(traversal(root))
+    draw_tree(root, title=title, colors=traversal_overlay(order, cmap=cmap))
     return [node.val for node in order]
 
 
+def visualize_traversals(root: Optional[Node],
+                         traversals: Sequence[Tuple[TraversalFn, str]],
+                         cmap=cm.Blues) -> List[List[int]]:
+    """Кілька обходів одного спільного дерева поруч, кожен — лише власна накладка кольорів"""
+    if root is None:
+        return [[] for _ in traversals]
+    fig, axes = plt.subplots(1, len(traversals), figsize=(6 * len(traversals), 5), squeeze=False)
+    orders = []
+    for ax, (traversal, title) in zip(axes[0], traversals):
+        order = list(traversal(root))
+        draw_tree(root, title=title, colors=traversal_overlay(order, cmap=cmap), ax=ax)
+        orders.append([node.val for node in order])
+    plt.show()
+    return orders
+
+
 def build_sample_tree() -> Node:
     root = Node(0)
     root.left = Node(4)
@@ -100,4 +250,17 @@ if __name__ == "__main__":
     print("BFS порядок відвідування:", bfs_order_vals)
 
     dfs_order_vals = visualize_traversal(tree, dfs_traversal, title="DFS (глибина)", cmap=cm.Blues)
-    print("DFS порядок відвідування:", dfs_order_vals)
\ No newline at end of file
+    print("DFS порядок відвідування:", dfs_order_vals)
+
+    visualize_traversals(tree, [(iter_preorder, "Pre-order"), (iter_inorder, "In-order"),
+                                (iter_postorder, "Post-order")], cmap=cm.Purples)
+
+    print("In-order (Морріс):", [node.val for node in morris_inorder(tree)])
+    print("Post-order:", [node.val for node in iter_postorder(tree)])
+    print("Рівні:", [[node.val for node in level] for level in iter_levels(tree)])
+    found = find_node(tree, lambda node: node.val == 10, traversal=iter_preorder)
+    print("Знайдено:", found.val if found else None)
+
+    compact = ArrayTree.from_node(tree)
+    print("ArrayTree BFS:", visualize_traversal(compact, bfs_traversal, title="BFS (ArrayTree)", cmap=cm.Greens))
+    print("Глибини:", compact.depths().tolist())
\ No newline at end of file
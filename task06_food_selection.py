@@ -1,6 +1,8 @@
 # python task06_food_selection.py --budget 110
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 items: Dict[str, Dict[str, int]] = {
     "pizza": {"cost": 50, "calories": 300},
     "hamburger": {"cost": 40, "calories": 250},
@@ -28,7 +30,12 @@ def greedy_algorithm(items: Dict[str, Dict[str, int]], budget: int) -> Dict[str,
     return {"chosen": chosen, "cost": spent, "calories": gained}
 
 
-def dynamic_programming(items: Dict[str, Dict[str, int]], budget: int) -> Dict[str, int | List[str]]:
+def dynamic_programming(items: Dict[str, Dict[str, int]], budget: int, method: str = "table") -> Dict[str, int | List[str]]:
+    """method="table" — повна таблиця (n + 1) × (budget + 1); "bitset" — один рядок NumPy і біт вибору на клітинку"""
+    if method == "bitset":
+        return _dynamic_programming_bitset(items, budget)
+    if method != "table":
+        raise ValueError(f"Unknown method {method!r}; use 'table' or 'bitset'")
     names = list(items.keys())
     costs = [items[n]["cost"] for n in names]
     calories = [items[n]["calories"] for n in names]
@@ -58,6 +65,42 @@ def dynamic_programming(items: Dict[str, Dict[str, int]], budget: int) -> Dict[s
     return {"chosen": chosen, "cost": spent, "calories": gained}
 
 
+def _dynamic_programming_bitset(items: Dict[str, Dict[str, int]], budget: int) -> Dict[str, int | List[str]]:
+    """Той самий розв'язок, що й таблиця, але пам'ять — рядок int64 плюс n × (budget + 1) / 8 байтів.
+
+    Рядок оновлюється на місці зсунутим максимумом: права частина обчислюється зі старого рядка,
+    тож кожен предмет береться не більше одного разу. Біт (i, w) — чи взято предмет i при бюджеті w.
+    """
+    names = list(items.keys())
+    costs = [items[n]["cost"] for n in names]
+    calories = [items[n]["calories"] for n in names]
+    n = len(names)
+    width = max(budget, -1) + 1
+
+    best = np.zeros(width, dtype=np.int64)
+    taken = np.zeros((n, (width + 7) // 8), dtype=np.uint8)
+    take = np.zeros(width, dtype=bool)
+    for i, (c, cal) in enumerate(zip(costs, calories)):
+        if c > budget:
+            continue
+        candidate = best[:width - c] + cal
+        take[:c] = False
+        np.greater(candidate, best[c:], out=take[c:])
+        np.maximum(best[c:], candidate, out=best[c:])
+        taken[i] = np.packbits(take)
+
+    w = budget
+    chosen: List[str] = []
+    for i in range(n - 1, -1, -1):
+        if w >= 0 and taken[i, w >> 3] >> (7 - (w & 7)) & 1:
+            chosen.append(names[i])
+            w -= costs[i]
+    chosen.reverse()
+    spent = sum(items[n]["cost"] for n in chosen)
+    gained = sum(items[n]["calories"] for n in chosen)
+    return {"chosen": chosen, "cost": spent, "calories": gained}
+
+
 def _print_solution(title: str, result: Dict[str, int | List[str]]) -> None:
     print(title)
     print(f"  Обрано: {result['chosen']}")
@@ -69,11 +112,13 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--budget", type=int, default=90)
+    parser.add_argument("--method", choices=("table", "bitset"), default="table",
+                        help="DP storage: full table or a single NumPy row with a packed choice bitset")
     args = parser.parse_args()
 
     print(f"Бюджет: {args.budget}")
     greedy_res = greedy_algorithm(items, args.budget)
-    dp_res = dynamic_programming(items, args.budget)
+    dp_res = dynamic_programming(items, args.budget, method=args.method)
 
     _print_solution("\nЖадібний алгоритм:", greedy_res)
     _print_solution("\nДинамічне програмування:", dp_res)